@@ -1,79 +1,229 @@
 import sqlite3
 import hashlib
+import hmac
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import metrics
 
 DB_FILE = "users.db"
+POOL_SIZE = 8  # Connections kept open and shared by every session thread
+
+# PBKDF2 cost for new hashes; stored per row so older rows are upgraded on their next login
+HASH_ITERATIONS = int(os.getenv("AUTH_HASH_ITERATIONS", "100000"))
+HASH_WORKERS = max(1, min(4, os.cpu_count() or 1))  # hashlib releases the GIL, so threads run in parallel
+HASH_QUEUE_LIMIT = 64      # Hash jobs running or waiting before new ones are refused
+HASH_QUEUE_TIMEOUT = 5.0   # Seconds a caller waits for a queue slot
+
+# Per-username throttling of failed sign-ins
+MAX_FAILED_ATTEMPTS = 5
+FAILED_ATTEMPT_WINDOW = 15 * 60
+LOCKOUT_BASE = 30          # Seconds; doubles with every further failure
+LOCKOUT_MAX = 15 * 60
+
+class AuthBusyError(Exception):
+    """Raised when the password-hashing queue is full."""
+
+class LoginThrottled(Exception):
+    """Raised when a username has too many recent failed sign-ins."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many failed attempts. Try again in {int(retry_after) + 1} seconds.")
+        self.retry_after = retry_after
+
+# Tuned for many short reads (logins) and rare writes (registrations)
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # Readers never block the writer and vice versa
+    "PRAGMA synchronous=NORMAL",    # Safe with WAL, avoids an fsync per commit
+    "PRAGMA busy_timeout=5000",     # Wait for a lock instead of failing with "database is locked"
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",      # 8 MB page cache per connection
+)
+
+# Statements are kept as constants so sqlite3's per-connection statement cache reuses them
+SQL_SELECT_USER = 'SELECT password_hash, salt, full_name, iterations FROM users WHERE username = ?'
+SQL_INSERT_USER = (
+    'INSERT INTO users (username, password_hash, salt, full_name, iterations) VALUES (?, ?, ?, ?, ?) '
+    'ON CONFLICT(username) DO NOTHING'
+)
+SQL_UPDATE_HASH = 'UPDATE users SET password_hash = ?, salt = ?, iterations = ? WHERE username = ?'
+
+class ConnectionPool:
+    """A fixed-size pool of SQLite connections that can be used from any thread."""
+
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=5.0, check_same_thread=False, cached_statements=64)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it is returned to the pool (or closed if it broke) afterwards."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    conn.close()  # The connection is unusable; the pool opens a new one later
+                    raise
+                self._idle.put(conn)
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool():
+    """Return the connection pool for the current DB_FILE."""
+    with _pools_lock:
+        pool = _pools.get(DB_FILE)
+        if pool is None:
+            pool = _pools[DB_FILE] = ConnectionPool(DB_FILE)
+        return pool
 
-def init_db():
-    """Initialize the database with the users table."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            username TEXT PRIMARY KEY,
-            password_hash BLOB NOT NULL,
-            salt BLOB NOT NULL,
-            full_name TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
-
-def hash_password(password, salt=None):
+def init_db(pool=None):
+    """Initialize the database with the users table (in DB_FILE unless another `pool` is given)."""
+    with (pool or get_pool()).connection() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password_hash BLOB NOT NULL,
+                salt BLOB NOT NULL,
+                full_name TEXT,
+                iterations INTEGER NOT NULL DEFAULT 100000
+            )
+        ''')
+        # Databases created before per-row iteration counts were hashed with 100,000 iterations
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(users)')]
+        if 'iterations' not in columns:
+            conn.execute('ALTER TABLE users ADD COLUMN iterations INTEGER NOT NULL DEFAULT 100000')
+        conn.commit()
+
+def hash_password(password, salt=None, iterations=None):
     """Hash a password with a salt using PBKDF2."""
     if salt is None:
         salt = os.urandom(32)  # 32 bytes of salt
-    
-    # 100,000 iterations of SHA-256
+
+    # PBKDF2-HMAC-SHA256, HASH_ITERATIONS rounds unless the stored row says otherwise
     pwd_hash = hashlib.pbkdf2_hmac(
         'sha256',
         password.encode('utf-8'),
         salt,
-        100000
+        iterations or HASH_ITERATIONS
     )
     return pwd_hash, salt
 
-def register_user(username, password, full_name):
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="pbkdf2")
+_hash_slots = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+def hash_password_pooled(password, salt=None, iterations=None):
+    """Run hash_password on the bounded hashing pool, so concurrent logins cannot saturate the CPU."""
+    if not _hash_slots.acquire(timeout=HASH_QUEUE_TIMEOUT):
+        raise AuthBusyError("The server is busy, please try again in a moment.")
+    try:
+        with metrics.timed("auth_pbkdf2"):
+            return _hash_pool.submit(hash_password, password, salt, iterations).result()
+    finally:
+        _hash_slots.release()
+
+_failures = {}  # username -> [failed attempts, first failure time, locked until]
+_failures_lock = threading.Lock()
+
+def _check_throttle(username):
+    now = time.time()
+    with _failures_lock:
+        entry = _failures.get(username)
+        if entry is None:
+            return
+        if now - entry[1] > FAILED_ATTEMPT_WINDOW and now >= entry[2]:
+            del _failures[username]
+        elif now < entry[2]:
+            raise LoginThrottled(entry[2] - now)
+
+def _record_failure(username):
+    now = time.time()
+    with _failures_lock:
+        entry = _failures.setdefault(username, [0, now, 0.0])
+        entry[0] += 1
+        if entry[0] >= MAX_FAILED_ATTEMPTS:
+            entry[2] = now + min(LOCKOUT_MAX, LOCKOUT_BASE * 2 ** (entry[0] - MAX_FAILED_ATTEMPTS))
+        if len(_failures) > 10000:
+            # Drop stale entries so a flood of random usernames cannot grow this without bound
+            for name in [n for n, e in _failures.items() if now - e[1] > FAILED_ATTEMPT_WINDOW and now >= e[2]]:
+                del _failures[name]
+
+def register_user(username, password, full_name, pool=None):
     """Register a new user."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    # Check if user already exists
-    c.execute('SELECT username FROM users WHERE username = ?', (username,))
-    if c.fetchone():
-        conn.close()
-        return False, "Username already exists."
-    
-    pwd_hash, salt = hash_password(password)
-    
+    pool = pool or get_pool()
     try:
-        c.execute('INSERT INTO users (username, password_hash, salt, full_name) VALUES (?, ?, ?, ?)',
-                  (username, pwd_hash, salt, full_name))
-        conn.commit()
-        conn.close()
+        pwd_hash, salt = hash_password_pooled(password)
+        with pool.connection() as conn:
+            # A single atomic insert: concurrent registrations of the same name cannot both succeed
+            cursor = conn.execute(SQL_INSERT_USER, (username, pwd_hash, salt, full_name, HASH_ITERATIONS))
+            conn.commit()
+        if cursor.rowcount == 0:
+            return False, "Username already exists."
         return True, "User registered successfully."
     except Exception as e:
-        conn.close()
         return False, f"Error registering user: {str(e)}"
 
-def verify_user(username, password):
-    """Verify a user's credentials."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    c.execute('SELECT password_hash, salt, full_name FROM users WHERE username = ?', (username,))
-    row = c.fetchone()
-    conn.close()
-    
+@metrics.timed("auth_verify")
+def verify_user(username, password, pool=None):
+    """Verify a user's credentials.
+
+    Raises LoginThrottled after too many failed attempts for the username, and AuthBusyError
+    when the hashing queue is full.
+    """
+    _check_throttle(username)
+    pool = pool or get_pool()
+
+    with pool.connection() as conn:
+        row = conn.execute(SQL_SELECT_USER, (username,)).fetchone()
+
     if row:
-        stored_hash, salt, full_name = row
-        pwd_hash, _ = hash_password(password, salt)
-        
-        if pwd_hash == stored_hash:
+        stored_hash, salt, full_name, iterations = row
+        pwd_hash, _ = hash_password_pooled(password, salt, iterations)
+
+        if hmac.compare_digest(pwd_hash, stored_hash):
+            with _failures_lock:
+                _failures.pop(username, None)
+            if iterations < HASH_ITERATIONS:
+                # Upgrade the stored hash to the current cost while we know the password
+                new_hash, new_salt = hash_password_pooled(password)
+                with pool.connection() as conn:
+                    conn.execute(SQL_UPDATE_HASH, (new_hash, new_salt, HASH_ITERATIONS, username))
+                    conn.commit()
             return {
                 'username': username,
                 'name': full_name,
                 'email': username  # Treating username as email for consistency with Google Auth
             }
-            
+
+    _record_failure(username)
     return None
@@ -0,0 +1,55 @@
+"""Compare exact sp.solve against the NumPy companion-matrix solver for polynomial roots.
+
+Usage: python bench_roots.py [max_degree]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+import numeric_roots
+import symbolic_engine
+
+SOLVE_TIMEOUT = 10.0
+DEGREES = [2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 40, 50]
+BATCH_SIZE = 1000
+
+def random_polynomial(degree, rng):
+    coeffs = [rng.randint(-9, 9) for _ in range(degree + 1)]
+    coeffs[0] = rng.choice([c for c in range(-9, 10) if c])
+    text = " + ".join(f"({c})*x**{degree - i}" for i, c in enumerate(coeffs))
+    return coeffs, text
+
+def main(max_degree=50):
+    import sympy as sp
+
+    rng = random.Random(42)
+    pool = symbolic_engine.get_pool()
+    print(f"{'degree':>6} | {'sp.solve (ms)':>14} | {'numpy (ms)':>10} | {'max |p(r)|/|p|':>14} | {f'batch x{BATCH_SIZE} (ms)':>17}")
+    print("-" * 75)
+    for degree in [d for d in DEGREES if d <= max_degree]:
+        coeffs, text = random_polynomial(degree, rng)
+        canonical = sp.srepr(sp.sympify(text))
+
+        start = time.perf_counter()
+        try:
+            pool.run('solve', (canonical,), SOLVE_TIMEOUT)
+            exact_ms = f"{(time.perf_counter() - start) * 1000:.1f}"
+        except symbolic_engine.JobTimeout:
+            exact_ms = f">{SOLVE_TIMEOUT * 1000:.0f}"
+
+        start = time.perf_counter()
+        found = numeric_roots.roots(coeffs)
+        numeric_ms = (time.perf_counter() - start) * 1000
+        residual = np.max(np.abs(np.polyval(coeffs, found))) / np.linalg.norm(coeffs)
+
+        batch = [random_polynomial(degree, rng)[0] for _ in range(BATCH_SIZE)]
+        start = time.perf_counter()
+        numeric_roots.batch_roots(batch)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{degree:>6} | {exact_ms:>14} | {numeric_ms:>10.3f} | {residual:>14.2e} | {batch_ms:>17.1f}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
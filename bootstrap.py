@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+
+import streamlit as st
+from dotenv import load_dotenv
+
+import auth_db
+import kb_refresh
+import metrics
+import site_search
+
+CREDENTIALS_FILE = "google_credentials.json"
+PDF_DIR = Path(__file__).parent / 'knowledge_base'
+
+# Injected on every run (Streamlit rebuilds the page each rerun), but built only once per process
+APP_CSS = """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600&display=swap');
+    
+    html, body, [class*="css"] {
+        font-family: 'Inter', sans-serif;
+    }
+
+    .stApp {
+        background-color: #0d1117;
+        color: #c9d1d9;
+    }
+
+    section[data-testid="stSidebar"] {
+        background-color: #161b22;
+        border-right: 1px solid #30363d;
+    }
+
+    .res-card {
+        background-color: #161b22;
+        border: 1px solid #30363d;
+        border-radius: 8px;
+        padding: 24px;
+        margin-top: 20px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+
+    .stButton>button {
+        height: 3rem;
+        width: 100%;
+        background-color: #238636;
+        color: white;
+        font-size: 16px;
+        font-weight: 600;
+        border: 1px solid rgba(240, 246, 252, 0.1);
+        border-radius: 6px;
+        margin-top: 28px;
+        transition: all 0.2s;
+    }
+
+    .stButton>button:hover {
+        background-color: #2ea043;
+        border-color: #2ea043;
+        box-shadow: 0 0 0 3px rgba(46, 160, 67, 0.4);
+    }
+
+    h1, h2, h3 {
+        color: #ffffff !important;
+        font-weight: 700;
+    }
+
+    .stTextInput>div>div>input {
+        background-color: #0d1117;
+        color: #ffffff;
+        border: 1px solid #30363d;
+        border-radius: 6px;
+    }
+
+    .stTextInput>div>div>input:focus {
+        border-color: #58a6ff;
+        box-shadow: 0 0 0 3px rgba(88, 166, 255, 0.3);
+    }
+    
+    .metric-container {
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        padding: 10px;
+        background: #21262d;
+        border-radius: 8px;
+        border: 1px solid #30363d;
+    }
+    .metric-value {
+        font-size: 1.5rem;
+        font-weight: bold;
+        color: #58a6ff;
+    }
+    .metric-label {
+        font-size: 0.9rem;
+        color: #8b949e;
+    }
+    </style>
+"""
+
+@st.cache_resource(show_spinner=False)
+def init_app(kb_dir):
+    """One-time process setup: environment variables, user database, knowledge-base directory and its refresher."""
+    load_dotenv()
+    auth_db.init_db()  # Initialize the local user database
+    kb_dir.mkdir(exist_ok=True)
+    site_search.get_index(kb_dir)  # Build the Site Info index now so the first search is instant
+    kb_refresh.get_scheduler(kb_dir)  # Crawls the website in the background; requests never wait on it
+    metrics.start_exporters()  # /metrics endpoint and/or metrics file, when configured
+    return True
+
+@st.cache_resource(show_spinner=False)
+def write_google_credentials(client_id, project_id, client_secret):
+    """Write the OAuth client file the auth library reads, only when its content changed."""
+    credentials_dict = {
+        "web": {
+            "client_id": client_id,
+            "project_id": project_id,
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+            "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+            "client_secret": client_secret,
+            "redirect_uris": ["http://localhost:8501"],
+            "javascript_origins": ["http://localhost:8501"]
+        }
+    }
+    content = json.dumps(credentials_dict)
+    try:
+        with open(CREDENTIALS_FILE, "r") as f:
+            if f.read() == content:
+                return CREDENTIALS_FILE
+    except OSError:
+        pass
+    with open(CREDENTIALS_FILE, "w") as f:
+        f.write(content)
+    return CREDENTIALS_FILE
+
+@st.cache_resource(show_spinner=False)
+def get_model(api_key, model_name, generation_config):
+    """Configure the Gemini client and build the shared GenerativeModel once per process."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=generation_config
+    )
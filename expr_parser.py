@@ -0,0 +1,220 @@
+import math
+import re
+from functools import lru_cache
+
+import sympy as sp
+
+MAX_INPUT_LENGTH = 500
+MAX_DEPTH = 60            # Nesting of parentheses, powers and unary signs
+MAX_NUMBER_DIGITS = 60    # Digits in a single numeric literal
+MAX_EXPONENT = 1000       # Largest numeric exponent, also after sympy combines nested powers and products
+MAX_RESULT_DIGITS = 4000  # Largest integer a numeric power may evaluate to (below Python's 4300-digit str limit)
+
+_TOKEN_RE = re.compile(r"""
+    (?P<number>\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_]+)
+  | (?P<op>\*\*|[-+*/^(),])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+FUNCTIONS = {
+    'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
+    'asin': sp.asin, 'acos': sp.acos, 'atan': sp.atan,
+    'sinh': sp.sinh, 'cosh': sp.cosh, 'tanh': sp.tanh,
+    'exp': sp.exp, 'log': sp.log, 'ln': sp.log,
+    'sqrt': sp.sqrt, 'abs': sp.Abs,
+}
+CONSTANTS = {'pi': sp.pi, 'e': sp.E, 'E': sp.E, 'I': sp.I, 'i': sp.I}
+
+class ParseError(ValueError):
+    """Raised for input that is malformed or exceeds the parser's limits."""
+
+def tokenize(text):
+    """Split input into (kind, value, position) tokens."""
+    if len(text) > MAX_INPUT_LENGTH:
+        raise ParseError(f"Expression is too long (limit {MAX_INPUT_LENGTH} characters).")
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ParseError(f"Unexpected character '{text[pos]}' at position {pos + 1}.")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'number' and len(value.replace('.', '')) > MAX_NUMBER_DIGITS:
+            raise ParseError(f"Number at position {pos + 1} has too many digits.")
+        if kind == 'op' and value == '**':
+            value = '^'
+        if kind != 'space':
+            tokens.append((kind, value, pos))
+        pos = match.end()
+    return tokens
+
+def _digits(expr):
+    """Upper bound on the digits of the rational numbers SymPy multiplies out when `expr` is
+    raised to a rational power: numerator and denominator sizes, through nested powers and
+    products (which SymPy distributes over, e.g. (3x)^2 -> 9x^2)."""
+    if expr.is_Rational:
+        return max(math.log10(abs(expr.p)) if expr.p else 0, math.log10(expr.q))
+    if expr.is_Pow and expr.exp.is_Rational:
+        return _digits(expr.base) * abs(float(expr.exp))
+    if expr.is_Mul:
+        return sum(_digits(arg) for arg in expr.args)
+    return 0  # Floats keep a fixed precision; sums and functions are not expanded
+
+def _check_exponents(expr):
+    """Refuse an expression containing a power whose numeric exponent exceeds MAX_EXPONENT.
+
+    Sympy combines (x^1000)^1000 into x^1000000 and x^1000 * x^1000 into x^2000, so the
+    exponents of the built expression are checked, not just the ones typed.
+    """
+    for power in expr.atoms(sp.Pow):
+        if power.exp.is_number and abs(power.exp.evalf(15)) > MAX_EXPONENT:
+            raise ParseError(f"Exponent is too large (limit {MAX_EXPONENT}).")
+
+def _safe_pow(base, exponent):
+    """Build base**exponent, refusing numeric exponents that would blow up evaluation."""
+    if exponent.is_number:
+        if not exponent.is_finite or abs(exponent.evalf(15)) > MAX_EXPONENT:
+            raise ParseError(f"Exponent is too large (limit {MAX_EXPONENT}).")
+        if exponent.is_Rational and _digits(base) * abs(float(exponent)) > MAX_RESULT_DIGITS:
+            raise ParseError("Result of the power is too large.")
+    result = sp.Pow(base, exponent)
+    _check_exponents(result)
+    return result
+
+class _Parser:
+    """Recursive-descent parser with implicit multiplication (2x, 3(x+1), (x+1)(x-1), xy)."""
+
+    def __init__(self, text, symbols):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.depth = 0
+        self.symbols = symbols
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, None)
+
+    def take(self, value=None):
+        kind, tok, where = self.peek()
+        if kind is None:
+            raise ParseError("Unexpected end of expression.")
+        if value is not None and tok != value:
+            raise ParseError(f"Expected '{value}' at position {where + 1}.")
+        self.pos += 1
+        return kind, tok, where
+
+    def enter(self):
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            raise ParseError("Expression is nested too deeply.")
+
+    def parse(self):
+        if not self.tokens:
+            raise ParseError("Expression is empty.")
+        expr = self.sum()
+        kind, tok, where = self.peek()
+        if kind is not None:
+            raise ParseError(f"Unexpected '{tok}' at position {where + 1}.")
+        # Products of powers that each pass _safe_pow can still multiply out to a huge number
+        if any(_digits(number) > MAX_RESULT_DIGITS for number in expr.atoms(sp.Rational)):
+            raise ParseError("Result is too large.")
+        _check_exponents(expr)
+        return expr
+
+    def sum(self):
+        expr = self.term()
+        while self.peek()[1] in ('+', '-'):
+            op = self.take()[1]
+            right = self.term()
+            expr = expr + right if op == '+' else expr - right
+        return expr
+
+    def term(self):
+        expr = self.unary()
+        while True:
+            kind, tok, _ = self.peek()
+            if tok in ('*', '/'):
+                self.take()
+                right = self.unary()
+                expr = expr * right if tok == '*' else expr / right
+            elif kind in ('number', 'name') or tok == '(':
+                expr = expr * self.power()  # Implicit multiplication
+            else:
+                return expr
+
+    def unary(self):
+        if self.peek()[1] in ('+', '-'):
+            self.enter()
+            op = self.take()[1]
+            operand = self.unary()
+            self.depth -= 1
+            return -operand if op == '-' else operand
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.peek()[1] == '^':
+            self.take()
+            self.enter()
+            exponent = self.unary()  # Right-associative: 2^3^2 = 2^(3^2)
+            self.depth -= 1
+            return _safe_pow(base, exponent)
+        return base
+
+    def atom(self):
+        kind, tok, where = self.take()
+        if kind == 'number':
+            return sp.Integer(tok) if tok.isdigit() else sp.Float(tok)
+        if kind == 'name':
+            return self.name(tok, where)
+        if tok == '(':
+            self.enter()
+            expr = self.sum()
+            self.take(')')
+            self.depth -= 1
+            return expr
+        raise ParseError(f"Unexpected '{tok}' at position {where + 1}.")
+
+    def name(self, tok, where):
+        if tok in FUNCTIONS and self.peek()[1] == '(':
+            self.take('(')
+            self.enter()
+            argument = self.sum()
+            self.take(')')
+            self.depth -= 1
+            return FUNCTIONS[tok](argument)
+        if tok in CONSTANTS:
+            return CONSTANTS[tok]
+        if tok in FUNCTIONS:
+            raise ParseError(f"Function '{tok}' at position {where + 1} needs parentheses, e.g. {tok}(x).")
+        # Juxtaposed letters are separate variables multiplied together: xy -> x*y
+        result = sp.Integer(1)
+        for letter in tok:
+            if letter not in self.symbols:
+                raise ParseError(f"Unknown variable '{letter}' at position {where + 1}.")
+            result *= self.symbols[letter]
+        return result
+
+_LETTERS = "abcdfghjklmnopqrstuvwxyzABCDFGHJKLMNOPQRSTUVWXYZ"
+
+@lru_cache(maxsize=2048)
+def _parse_cached(text, variables):
+    symbols = {name: sp.Symbol(name) for name in variables}
+    return _Parser(text, symbols).parse()
+
+def parse_expression(text, variables=_LETTERS):
+    """Parse user input into a SymPy expression without eval, within fixed size limits.
+
+    Supports + - * / ^ (or **), parentheses, implicit multiplication, common functions and
+    the constants pi, e and i. Only single letters in `variables` become symbols. Results are
+    cached, so repeated inputs are parsed once. Raises ParseError with a readable message.
+    """
+    return _parse_cached(text.strip(), variables)
+
+def parse_number(text):
+    """Parse a numeric input such as '3/2' or 'sqrt(2)'; raises ParseError if it has variables."""
+    value = parse_expression(text, variables="")
+    if not value.is_number:
+        raise ParseError("Please enter a number.")
+    return value
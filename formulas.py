@@ -0,0 +1,212 @@
+import re
+import warnings
+
+import numpy as np
+
+MAX_ROWS = 2_000_000
+CSV_CHUNK_ROWS = 100_000
+
+# --- Formulas (scalars or NumPy arrays; arrays are evaluated element-wise) ---
+
+def circle(radius):
+    return {'area': np.pi * radius**2, 'circumference': 2 * np.pi * radius}
+
+def rectangle(length, width):
+    return {'area': length * width, 'perimeter': 2 * (length + width)}
+
+def triangle(base, height):
+    return {'area': 0.5 * base * height}
+
+def sphere(radius):
+    return {'volume': (4 / 3) * np.pi * radius**3}
+
+def cube(side):
+    return {'volume': side**3}
+
+def cylinder(radius, height):
+    return {'volume': np.pi * radius**2 * height}
+
+def kinematics(u, a, t):
+    return {'v': u + a * t, 's': u * t + 0.5 * a * t**2}
+
+def trajectory(u, a, t_start, t_end, points):
+    """Sample v(t) and s(t) at `points` evenly spaced times; returns (t, v, s) arrays."""
+    t = np.linspace(t_start, t_end, points)
+    motion = kinematics(u, a, t)
+    return t, motion['v'], motion['s']
+
+def circle_equation(a, b, r):
+    """Coefficients D, E, F of the expanded form x^2 + y^2 + Dx + Ey + F = 0."""
+    return {'D': -2 * a, 'E': -2 * b, 'F': a**2 + b**2 - r**2}
+
+# name -> (formula, input columns, inputs that must not be negative)
+CALCULATORS = {
+    'Circle': (circle, ('radius',), {'radius'}),
+    'Rectangle': (rectangle, ('length', 'width'), {'length', 'width'}),
+    'Triangle': (triangle, ('base', 'height'), {'base', 'height'}),
+    'Sphere': (sphere, ('radius',), {'radius'}),
+    'Cube': (cube, ('side',), {'side'}),
+    'Cylinder': (cylinder, ('radius', 'height'), {'radius', 'height'}),
+    'Kinematics': (kinematics, ('u', 'a', 't'), set()),
+    'Circle Equation': (circle_equation, ('a', 'b', 'r'), {'r'}),
+}
+
+# --- Downsampling for charts ---
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices of the points to keep.
+
+    Keeps the first and last points and, from each of `threshold - 2` equal buckets in
+    between, the point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves the visual shape of the series.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            avg_x, avg_y = x[end:edges[i + 2]].mean(), y[end:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+def downsample(x, series, threshold):
+    """Indices that keep the shape of every series in `series` (union of their LTTB picks)."""
+    if len(x) <= threshold:
+        return np.arange(len(x))
+    return np.unique(np.concatenate([lttb(x, y, threshold) for y in series]))
+
+# --- Table input/output ---
+
+def _column_key(name):
+    """Normalize a header cell: 'Radius (m)' -> 'radius'."""
+    return re.sub(r"[\(\[].*?[\)\]]", "", name).strip().lower()
+
+def _is_number(cell):
+    try:
+        float(cell)
+        return True
+    except ValueError:
+        return False
+
+def _split(line, delimiter):
+    return [c.strip() for c in (line.split(delimiter) if delimiter else line.split())]
+
+_IS_SPACE = np.zeros(256, dtype=bool)  # Byte -> is whitespace, for _fields_per_line
+_IS_SPACE[list(b" \t\r\n\v\f")] = True
+
+def _fields_per_line(text):
+    """Number of whitespace-separated fields on each line of `text`, counted without a Python loop."""
+    chars = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    space = _IS_SPACE[chars]
+    is_start = ~space
+    is_start[1:] &= space[:-1]
+    starts = np.flatnonzero(is_start)
+    line_bounds = np.concatenate(([0], np.flatnonzero(chars == ord("\n")) + 1, [len(chars)]))
+    return np.diff(np.searchsorted(starts, line_bounds))
+
+def read_table(data):
+    """Parse a CSV upload or pasted table of numbers.
+
+    Comma, semicolon, tab and whitespace separators are detected from the first line, and
+    the header row is optional. Returns (column names or None, float array of shape
+    (rows, columns)); cells that are not numbers become NaN.
+    """
+    text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+    text = text.strip()
+    if not text:
+        raise ValueError("The table is empty.")
+    first, _, body = text.partition("\n")
+    first = first.strip()
+    delimiter = next((d for d in ("\t", ";", ",") if d in first), None)
+    cells = _split(first, delimiter)
+    if all(_is_number(c) for c in cells):
+        columns, body = None, text
+    else:
+        columns = cells
+    width = len(cells)
+
+    rows = body.count("\n") + 1 if body.strip() else 0
+    if rows > MAX_ROWS:
+        raise ValueError(f"The table has more than {MAX_ROWS:,} rows.")
+    if rows == 0:
+        return columns, np.empty((0, width))
+
+    # Fast path: one C-level parse of the whole body; used only when every line has exactly
+    # `width` fields, since a matching total alone lets values shift between short and long rows
+    flat = body.replace(delimiter, " ") if delimiter else body
+    if (_fields_per_line(flat) == width).all():
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # Older NumPy warns instead of raising on trailing text
+                values = np.fromstring(flat, dtype=float, sep=" ")
+        except ValueError:
+            values = None
+        if values is not None and values.size == rows * width:
+            return columns, values.reshape(rows, width)
+
+    # Slow path for blank lines, missing cells or text: parse row by row
+    parsed = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        row = []
+        for cell in _split(line, delimiter)[:width]:
+            try:
+                row.append(float(cell))
+            except ValueError:
+                row.append(np.nan)
+        parsed.append(row + [np.nan] * (width - len(row)))
+    return columns, np.array(parsed, dtype=float).reshape(-1, width)
+
+def evaluate(calculator, columns, values):
+    """Apply a calculator to every row of a table at once.
+
+    Input columns are matched by header name (case-insensitive, units in brackets ignored),
+    or by position when the table has no header. Rows with missing or out-of-range inputs
+    get NaN results. Returns (output column names, output array, number of invalid rows).
+    """
+    formula, inputs, nonnegative = CALCULATORS[calculator]
+    if columns is None:
+        if values.shape[1] < len(inputs):
+            raise ValueError(f"Expected {len(inputs)} columns: {', '.join(inputs)}.")
+        index = list(range(len(inputs)))
+    else:
+        keys = [_column_key(c) for c in columns]
+        missing = [name for name in inputs if name not in keys]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}. Expected: {', '.join(inputs)}.")
+        index = [keys.index(name) for name in inputs]
+
+    arrays = [values[:, i] for i in index]
+    invalid = np.zeros(len(values), dtype=bool)
+    for name, column in zip(inputs, arrays):
+        invalid |= np.isnan(column)
+        if name in nonnegative:
+            invalid |= column < 0
+
+    with np.errstate(all='ignore'):
+        outputs = formula(*arrays)
+    result = np.column_stack(arrays + list(outputs.values()))
+    result[invalid, len(inputs):] = np.nan
+    return list(inputs) + list(outputs), result, int(invalid.sum())
+
+def to_csv(columns, values, digits=10):
+    """Encode a result table as CSV bytes."""
+    row_format = ",".join([f"%.{digits}g"] * len(columns)) + "\n"
+    parts = [(",".join(columns) + "\n").encode('utf-8')]
+    for start in range(0, len(values), CSV_CHUNK_ROWS):
+        chunk = values[start:start + CSV_CHUNK_ROWS]
+        parts.append(((row_format * len(chunk)) % tuple(chunk.ravel())).encode('ascii'))
+    return b"".join(parts)
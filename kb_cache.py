@@ -0,0 +1,124 @@
+import hashlib
+import re
+import threading
+from pathlib import Path
+
+import metrics
+
+_SECTION_RE = re.compile(r"\n={10,}\nURL: (.+)\n={10,}\n")
+
+_lock = threading.Lock()
+_files = {}      # path -> KBFile, reused until the file's mtime or size changes
+_snapshots = {}  # kb_dir -> KBSnapshot
+
+def estimate_tokens(text):
+    """Estimate the model token count of `text` (roughly four characters per token)."""
+    return (len(text) + 3) // 4
+
+def chunk_text(text, source, max_chars=1200):
+    """Split a knowledge-base file into chunks of at most `max_chars` characters.
+
+    Scraped files are split on their per-page URL headers first, so a chunk never mixes pages.
+    Returns a list of (source, text) tuples where source names the file and page.
+    """
+    pieces = _SECTION_RE.split(text)
+    # split() alternates: leading text, url, body, url, body, ...
+    sections = [(source, pieces[0])]
+    for i in range(1, len(pieces) - 1, 2):
+        sections.append((f"{source} | {pieces[i].strip()}", pieces[i + 1]))
+
+    chunks = []
+    for label, body in sections:
+        current = []
+        size = 0
+        for line in body.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if current and size + len(line) > max_chars:
+                chunks.append((label, "\n".join(current)))
+                current, size = [], 0
+            current.append(line[:max_chars])
+            size += len(line) + 1
+        if current:
+            chunks.append((label, "\n".join(current)))
+    return chunks
+
+class KBFile:
+    """One decoded knowledge-base file together with the structures derived from it."""
+
+    def __init__(self, path, mtime_ns, size, text):
+        self.path = path
+        self.name = path.name
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.text = text
+        self.sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        self.chunks = chunk_text(text, self.name)
+        self.tokens = estimate_tokens(text)
+
+class KBSnapshot:
+    """An immutable view of the knowledge base shared by every session."""
+
+    def __init__(self, files):
+        self.files = files
+        self.signature = [[f.name, f.mtime_ns, f.size] for f in files]
+        self.version = hashlib.sha256(
+            "\n".join(f"{f.name}:{f.sha256}" for f in files).encode('utf-8')
+        ).hexdigest()
+        self.corpus = "".join(f"\n\n--- Source: {f.name} ---\n{f.text}" for f in files)
+        self.chunks = [chunk for f in files for chunk in f.chunks]
+        self.tokens = sum(f.tokens for f in files)
+
+@metrics.timed("kb_snapshot")
+def get_snapshot(kb_dir):
+    """Return the current knowledge-base snapshot for `kb_dir`.
+
+    Every call stats the text files, but only files whose mtime or size changed are read and
+    decoded again; when nothing changed the previous snapshot object is returned as is.
+    """
+    kb_dir = Path(kb_dir)
+    stats = []
+    for path in sorted(kb_dir.glob('*.txt')):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed between glob and stat
+        stats.append((path, stat.st_mtime_ns, stat.st_size))
+
+    with _lock:
+        snapshot = _snapshots.get(kb_dir)
+        if snapshot is not None and snapshot.signature == [[p.name, m, s] for p, m, s in stats]:
+            return snapshot
+
+        files = []
+        for path, mtime_ns, size in stats:
+            cached = _files.get(path)
+            if cached is None or cached.mtime_ns != mtime_ns or cached.size != size:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        cached = KBFile(path, mtime_ns, size, f.read())
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"Skipping knowledge-base file {path.name}: {e}")
+                    continue
+                _files[path] = cached
+            files.append(cached)
+
+        for path in [p for p in _files if p.parent == kb_dir and p not in {s[0] for s in stats}]:
+            del _files[path]
+
+        snapshot = KBSnapshot(files)
+        _snapshots[kb_dir] = snapshot
+        return snapshot
+
+def invalidate(kb_dir=None):
+    """Drop cached files so the next get_snapshot() re-reads them (all directories if kb_dir is None)."""
+    with _lock:
+        if kb_dir is None:
+            _files.clear()
+            _snapshots.clear()
+            return
+        kb_dir = Path(kb_dir)
+        _snapshots.pop(kb_dir, None)
+        for path in [p for p in _files if p.parent == kb_dir]:
+            del _files[path]
@@ -0,0 +1,165 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import kb_cache
+from scraper import scrape_website, manifest_path
+
+TARGET_URL = "https://bublooscientist.com"
+OUTPUT_NAME = "scraped_content.txt"
+LOCK_NAME = ".kb_refresh.lock"
+REFRESH_SECONDS = 6 * 60 * 60  # Re-check the website for changes every 6 hours
+CHECK_SECONDS = 60             # How often the scheduler looks at the crawl's age
+RETRY_SECONDS = 15 * 60        # Minimum gap between crawl attempts, across all workers
+
+@contextmanager
+def _exclusive_lock(path):
+    """Non-blocking exclusive lock on `path` shared by every process; yields whether it was acquired."""
+    f = open(path, 'a+')
+    try:
+        try:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        f.close()  # Closing the file releases the lock
+
+class RefreshScheduler:
+    """Keeps the scraped knowledge base fresh without ever blocking a user request.
+
+    Every worker process may run one of these on a daemon thread. A crawl starts when the
+    last one is older than `interval`; an exclusive file lock in the knowledge-base directory
+    makes sure only one process crawls at a time, and the lock file records the start of the
+    last attempt so a failing site is retried at most every RETRY_SECONDS. The scraper writes the
+    output through a temporary file and an atomic rename, so readers never see a partial file.
+    """
+
+    def __init__(self, kb_dir, url=TARGET_URL, interval=REFRESH_SECONDS):
+        self.kb_dir = Path(kb_dir)
+        self.url = url
+        self.interval = interval
+        self.output_file = self.kb_dir / OUTPUT_NAME
+        self.lock_file = self.kb_dir / LOCK_NAME
+        self.running = False
+        self.last_result = None  # (finished_at, success, message) of this process's last crawl
+        self._stop = threading.Event()
+        self._thread = None
+
+    def last_crawl(self):
+        """Time of the last completed crawl by any process, or None."""
+        try:
+            return os.stat(manifest_path(str(self.output_file))).st_mtime
+        except OSError:
+            return None
+
+    def last_attempt(self):
+        """Start time of the last crawl attempt by any process (recorded in the lock file), or 0."""
+        try:
+            return float(self.lock_file.read_text() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def is_due(self):
+        last = self.last_crawl()
+        if last is not None and self.output_file.exists() and time.time() - last < self.interval:
+            return False
+        return time.time() - self.last_attempt() >= RETRY_SECONDS
+
+    def refresh(self, force=False):
+        """Crawl now if due (or `force`) and no other process is crawling; returns True if a crawl ran."""
+        if not force and not self.is_due():
+            return False
+        self.kb_dir.mkdir(exist_ok=True)
+        with _exclusive_lock(self.lock_file) as acquired:
+            if not acquired or (not force and not self.is_due()):
+                return False  # Another process is crawling or has just finished
+            self.lock_file.write_text(str(time.time()))  # Record the attempt for every worker's retry check
+            self.running = True
+            try:
+                success, message = scrape_website(self.url, output_file=str(self.output_file), incremental=True)
+            except Exception as e:
+                success, message = False, str(e)
+            finally:
+                self.running = False
+        self.last_result = (time.time(), success, message)
+        print(f"Knowledge-base refresh {'finished' if success else 'failed'}: {message}")
+        if success:
+            self._invalidate()
+        return True
+
+    def _invalidate(self):
+        """Drop this process's cached knowledge base and rebuild the derived indexes off the request path.
+
+        Other workers notice the new file on their next snapshot, which compares mtimes and sizes.
+        """
+        import retrieval
+        import site_search
+
+        kb_cache.invalidate(self.kb_dir)
+        retrieval.get_index(self.kb_dir)
+        site_search.get_index(self.kb_dir)
+
+    def run(self):
+        """Scheduler loop; returns when stop() is called."""
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Knowledge-base refresh error: {e}")
+            self._stop.wait(CHECK_SECONDS)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="kb-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        """Human-readable state of the knowledge-base crawl."""
+        if self.running:
+            return "Website crawl in progress in the background."
+        last = self.last_crawl()
+        if last is None:
+            return "The website has not been crawled yet; a background crawl is scheduled."
+        text = f"Website last crawled {max(0, int(time.time() - last) // 60)} min ago."
+        if self.last_result and not self.last_result[1]:
+            text += f" The latest attempt failed: {self.last_result[2]}"
+        return text
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler(kb_dir):
+    """Return the process-wide scheduler, starting its thread unless KB_REFRESH_IN_APP=0.
+
+    Set KB_REFRESH_IN_APP=0 when `python kb_refresh.py` runs as a separate service instead.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler(kb_dir)
+            if os.getenv("KB_REFRESH_IN_APP", "1") != "0":
+                _scheduler.start()
+        return _scheduler
+
+if __name__ == "__main__":
+    # Standalone refresher: `python kb_refresh.py` runs the schedule, `--once` forces a single crawl
+    scheduler = RefreshScheduler(Path(__file__).parent / 'knowledge_base')
+    if "--once" in sys.argv:
+        scheduler.refresh(force=True)
+    else:
+        scheduler.run()
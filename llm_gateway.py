@@ -0,0 +1,221 @@
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import metrics
+
+MAX_CONCURRENCY = 4       # Upstream calls running at once; further calls queue
+RATE_PER_SECOND = 1.0     # Sustained upstream request rate
+BURST = 5                 # Requests allowed back to back before the rate applies
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0        # Seconds; doubled after every failed attempt
+BACKOFF_MAX = 20.0
+REQUEST_TIMEOUT = 90.0    # Seconds a caller waits for a complete answer
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded'}
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every upstream call."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def is_retryable(exc):
+    """Whether an upstream error is worth retrying (rate limits and transient server errors)."""
+    code = getattr(exc, 'code', None)
+    if callable(code):
+        try:
+            code = code()
+        except Exception:
+            code = None
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    return type(exc).__name__ in RETRYABLE_ERRORS or isinstance(exc, (TimeoutError, ConnectionError))
+
+def _chunk_text(chunk):
+    try:
+        return chunk.text
+    except ValueError:
+        return ""  # Chunks without text parts (e.g. the final finish-reason chunk)
+
+class _SharedCall:
+    """One upstream call whose streamed text is fanned out to every coalesced caller."""
+
+    def __init__(self):
+        self.pieces = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.cond = threading.Condition()
+
+    def append(self, text):
+        with self.cond:
+            self.pieces.append(text)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+    @property
+    def abandoned(self):
+        with self.cond:
+            return self.subscribers == 0
+
+    def subscribe(self, timeout):
+        """Register a caller and return an iterator over the text pieces as they arrive.
+
+        The iterator raises the upstream error, or TimeoutError once `timeout` seconds pass.
+        """
+        with self.cond:
+            self.subscribers += 1
+        return self._iter_text(timeout)
+
+    def _iter_text(self, timeout):
+        deadline = time.monotonic() + timeout
+        index = 0
+        try:
+            while True:
+                with self.cond:
+                    while index == len(self.pieces) and not self.done:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"LLM request timed out after {timeout:g}s")
+                        self.cond.wait(remaining)
+                    pieces = self.pieces[index:]
+                    index = len(self.pieces)
+                    done, error = self.done, self.error
+                yield from pieces
+                if done and index == len(self.pieces):
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            with self.cond:
+                self.subscribers -= 1
+
+class LLMGateway:
+    """Process-wide dispatcher for model calls.
+
+    Calls run on a bounded thread pool behind a token bucket, are retried with exponential
+    backoff and jitter on rate-limit and transient errors, and identical in-flight requests
+    (same coalescing key) share a single upstream call.
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, rate=RATE_PER_SECOND, burst=BURST,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX,
+                 timeout=REQUEST_TIMEOUT):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.stats = {'calls': 0, 'coalesced': 0, 'retries': 0, 'failures': 0}
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def stream(self, model, parts, key=None, timeout=None):
+        """Start (or join) a streamed generation and return an iterator over its text pieces."""
+        with self._lock:
+            call = self._inflight.get(key) if key is not None else None
+            if call is not None:
+                self.stats['coalesced'] += 1
+                return call.subscribe(timeout or self.timeout)
+
+            call = _SharedCall()
+            if key is not None:
+                self._inflight[key] = call
+            self.stats['calls'] += 1
+            # Subscribe before submitting so the worker never sees the call as abandoned
+            pieces = call.subscribe(timeout or self.timeout)
+            self._pool.submit(self._run, call, key, model, parts)
+            return pieces
+
+    def generate(self, model, parts, key=None, timeout=None):
+        """Run a generation to completion and return its full text."""
+        return "".join(self.stream(model, parts, key, timeout))
+
+    def _drop_if_abandoned(self, call, key):
+        """Stop new callers from joining `call` once nobody is listening; returns whether it was abandoned.
+
+        Runs under the gateway lock, which stream() also holds while joining a call.
+        """
+        with self._lock:
+            if not call.abandoned:
+                return False
+            if key is not None and self._inflight.get(key) is call:
+                del self._inflight[key]
+            return True
+
+    def _run(self, call, key, model, parts):
+        error = None
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.bucket.acquire()
+                emitted = False
+                try:
+                    with metrics.timed("llm_generate"):
+                        for chunk in model.generate_content(parts, stream=True):
+                            text = _chunk_text(chunk)
+                            if text:
+                                call.append(text)
+                                emitted = True
+                            if self._drop_if_abandoned(call, key):
+                                # Every caller went away (e.g. a new query was submitted); the text so
+                                # far is not an answer, so the call ends with an error, not a result
+                                error = CancelledError("Every caller of this LLM request went away")
+                                break
+                    break
+                except Exception as e:
+                    # A partially streamed answer cannot be retried transparently
+                    if emitted or attempt == self.max_retries or not is_retryable(e):
+                        raise
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                    with self._lock:
+                        self.stats['retries'] += 1
+                    metrics.inc("llm_retries_total")
+                    print(f"LLM call failed ({type(e).__name__}), retrying in ~{delay:.1f}s")
+                    time.sleep(random.uniform(0, delay))  # Full jitter
+        except Exception as e:
+            error = e
+            with self._lock:
+                self.stats['failures'] += 1
+        finally:
+            if key is not None:
+                with self._lock:
+                    if self._inflight.get(key) is call:
+                        del self._inflight[key]
+            call.finish(error)
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def get_gateway():
+    """Return the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,179 @@
+import bisect
+import cProfile
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRIC_PREFIX = "bubloo_"
+# Histogram bucket upper bounds in seconds, from a cache hit to a slow model answer
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Exporters and profiling are configured by environment variables (read after load_dotenv):
+#   METRICS_PORT  serve /metrics on this port (bound to METRICS_HOST, 127.0.0.1 by default)
+#   METRICS_FILE  rewrite this file in Prometheus text format every METRICS_FILE_SECONDS
+#   PROFILE_DIR   where profiled requests are saved; profiling is off when unset
+METRICS_FILE_SECONDS = 15
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+_exporters_started = False
+
+def _key(name, labels):
+    return METRIC_PREFIX + name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def inc(name, amount=1, **labels):
+    """Add `amount` to a counter; by convention counter names end in _total."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def observe(name, value, **labels):
+    """Record one value (seconds, for the default buckets) in a histogram."""
+    key = _key(name, labels)
+    index = bisect.bisect_left(LATENCY_BUCKETS, value)
+    with _lock:
+        counts = _histograms.get(key)
+        if counts is None:
+            counts = _histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+        counts[index] += 1
+        counts[-1] += value
+
+@contextmanager
+def timed(name, **labels):
+    """Time a block (or, used as a decorator, every call of a function).
+
+    The duration goes to the `<name>_seconds` histogram and exceptions are counted in
+    `<name>_errors_total` before they propagate.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc(f"{name}_errors_total", **labels)
+        raise
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+# --- Export ---
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(pairs):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus():
+    """Every metric of this process in the Prometheus text exposition format."""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(counts)) for key, counts in _histograms.items())
+    lines = []
+    declared = set()
+    for (name, labels), value in counters:
+        if name not in declared:
+            declared.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    for (name, labels), counts in histograms:
+        if name not in declared:
+            declared.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), counts):
+            cumulative += count
+            le = bound if isinstance(bound, str) else _number(bound)
+            lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(counts[-1])}")
+        lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+def write_file(path):
+    """Write the metrics to `path` atomically (for a textfile collector or a sidecar)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would drown the app's own output
+
+def _write_file_loop(path):
+    while True:
+        try:
+            write_file(path)
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {e}")
+        time.sleep(METRICS_FILE_SECONDS)
+
+def start_exporters():
+    """Start the configured /metrics endpoint and/or metrics file writer, once per process.
+
+    With several workers on one host only the first can bind METRICS_PORT; give each worker
+    its own METRICS_FILE or port to collect all of them.
+    """
+    global _exporters_started
+    with _lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    host, port, path = os.getenv("METRICS_HOST", "127.0.0.1"), int(os.getenv("METRICS_PORT", "0")), os.getenv("METRICS_FILE")
+    if port:
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Metrics endpoint not started on port {port}: {e}")
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            print(f"Serving metrics on http://{host}:{port}/metrics")
+    if path:
+        threading.Thread(target=_write_file_loop, args=(path,), name="metrics-file", daemon=True).start()
+
+# --- Profiling ---
+
+@contextmanager
+def profiled(label, enabled=True):
+    """Run a block under cProfile and save the stats to $PROFILE_DIR when `enabled`.
+
+    The .prof file opens with `python -m pstats` or snakeviz. Only the calling thread is
+    profiled; for work on other threads or processes attach `py-spy record --pid` instead.
+    """
+    profile_dir = os.getenv("PROFILE_DIR")
+    if not enabled or not profile_dir:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        profiler = None  # Another request is being profiled (one profiler per process on Python 3.12+)
+    if profiler is None:
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(profile_dir, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-") or "request"
+        path = os.path.join(profile_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+        profiler.dump_stats(path)
+        print(f"Profile of {label} saved to {path}")
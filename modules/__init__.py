@@ -0,0 +1,30 @@
+import importlib
+import sys
+import time
+
+import metrics
+
+# Sidebar label -> module in this package. A module (and the heavy libraries it needs, such
+# as SymPy or the Gemini client) is imported the first time its entry is selected.
+MODULES = {
+    "AI Lab Assistant": "ai_lab",
+    "Site Info Guide": "site_info",
+    "Geometry (2D & 3D)": "geometry",
+    "Circle Equations": "circle",
+    "Algebra & Polynomials": "algebra",
+    "Probability & Series": "probability",
+    "Kinematics": "kinematics",
+}
+
+def load(label):
+    """Import the module behind a sidebar entry (once per process) and return it."""
+    name = MODULES[label]
+    qualified = f"{__name__}.{name}"
+    module = sys.modules.get(qualified)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(qualified)
+        elapsed = time.perf_counter() - start
+        metrics.observe("module_import_seconds", elapsed, module=name)
+        print(f"Loaded module {name} in {elapsed * 1000:.0f} ms")
+    return module
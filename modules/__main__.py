@@ -0,0 +1,45 @@
+"""Measure cold-start cost per module: `python -m modules`.
+
+Each module is imported in a fresh interpreter (after Streamlit itself), reporting the import
+time and the resulting peak memory. The last row imports every module, which is what each
+worker paid when app.py imported everything up front.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from modules import MODULES
+
+_PROBE = """
+import importlib, json, resource, sys, time
+import streamlit
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module("modules." + name)
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+print(json.dumps({"ms": elapsed * 1000, "rss_mb": rss}))
+"""
+
+def probe(names):
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, *names], capture_output=True, text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    rows = [(name, [name]) for name in MODULES.values()] + [("(all modules)", list(MODULES.values()))]
+    print(f"{'module':<16}{'import ms':>12}{'peak RSS MB':>14}")
+    for label, names in rows:
+        stats = probe(names)
+        if stats is None:
+            print(f"{label:<16}{'failed':>12}")
+        else:
+            print(f"{label:<16}{stats['ms']:>12.0f}{stats['rss_mb']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
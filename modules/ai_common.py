@@ -0,0 +1,97 @@
+import os
+import time
+
+import streamlit as st
+
+import bootstrap
+import kb_cache
+import metrics
+import prompt_builder
+import prompt_cache
+import retrieval
+
+RETRIEVAL_TOP_K = 6  # Number of knowledge-base chunks sent with each question
+
+# Model configuration
+generation_config = {
+    "temperature": 0.5,
+    "top_p": 0.8,
+    "top_k": 4,
+    "max_output_tokens": 2048,
+}
+
+MODEL_NAME = 'gemini-2.5-flash'
+
+def get_model():
+    """The shared Gemini model (google.generativeai is only imported by modules that call this)."""
+    # Gemini AI Setup
+    api_key = st.secrets.get("GEMINI_API_KEY", os.getenv('GEMINI_API_KEY'))
+    return bootstrap.get_model(api_key, MODEL_NAME, generation_config)
+
+# --- AI HELPER FUNCTIONS ---
+def _reserved_tokens(query):
+    """Tokens of a prompt besides its knowledge-base context: instructions and question."""
+    return kb_cache.estimate_tokens(build_system_context("") + f"User question: {query}")
+
+def _report_context(label, report):
+    prompt_builder.log_report(label, report)
+    metrics.inc("prompt_tokens_total", report['tokens'], module=label)
+    metrics.inc("prompt_tokens_saved_total", report['saved_tokens'], module=label)
+
+def retrieved_context(query, label):
+    """Knowledge-base chunks most relevant to `query`, deduplicated and cut to PROMPT_TOKEN_BUDGET."""
+    results = retrieval.get_index(bootstrap.PDF_DIR).search(query, RETRIEVAL_TOP_K)
+    context, report = prompt_builder.compress(
+        [(source, text) for _, source, text in results], prompt_builder.PROMPT_TOKEN_BUDGET, _reserved_tokens(query),
+    )
+    _report_context(label, report)
+    return context
+
+def prefix_context(kb_snapshot, query, label):
+    """The whole deduplicated knowledge base for a cached prompt prefix, or None when it does not
+    fit PREFIX_TOKEN_BUDGET together with the instructions and question."""
+    context, report = prompt_builder.corpus_context(kb_snapshot)
+    if report['tokens'] + _reserved_tokens(query) > prompt_builder.PREFIX_TOKEN_BUDGET:
+        return None
+    _report_context(label, report)
+    return context
+
+def build_system_context(context):
+    """Static part of the AI Lab prompt: instructions plus knowledge-base context."""
+    return f"""You are a helpful AI assistant for Bubloo Scientist website.
+
+Use the following Context to answer the user's question.
+
+--- Additional Context (Team Info, Website Content) ---
+{context}
+
+Answer questions PRIMARILY based on the provided Context.
+If the information is NOT in the context, you can use general knowledge but mention it."""
+
+@st.cache_resource
+def get_prefix_cache():
+    """Process-wide registration of the knowledge-base prompt prefix with Gemini context caching."""
+    return prompt_cache.PrefixCache(prompt_cache.GeminiContextBackend(MODEL_NAME, generation_config))
+
+def stream_response(pieces, on_text):
+    """Consume a stream of answer text, calling on_text with the text so far after every piece.
+
+    Returns (text, time_to_first_token, total_latency) in seconds. If the user submits a new
+    query, Streamlit stops this run at the next on_text call and the stream is closed, which
+    releases this caller's interest in the upstream call.
+    """
+    start = time.perf_counter()
+    first_token = None
+    text = ""
+    try:
+        for piece in pieces:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            text += piece
+            on_text(text)
+    finally:
+        close = getattr(pieces, 'close', None)
+        if close:
+            close()
+    total = time.perf_counter() - start
+    return text, (first_token if first_token is not None else total), total
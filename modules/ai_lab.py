@@ -0,0 +1,108 @@
+import time
+
+import streamlit as st
+
+import kb_cache
+import kb_refresh
+import llm_gateway
+import response_cache
+import semantic_cache
+from bootstrap import PDF_DIR
+from modules.ai_common import (
+    MODEL_NAME, build_system_context, generation_config, get_model, get_prefix_cache,
+    prefix_context, retrieved_context, stream_response,
+)
+
+# Knowledge bases of at least this size that fit PREFIX_TOKEN_BUDGET are registered once as a
+# cached prompt prefix; others fall back to sending only the retrieved chunks with each question
+CONTEXT_CACHE_MIN_TOKENS = 1024
+
+def render():
+    """AI Lab Assistant: questions answered from the knowledge base by Gemini."""
+    st.title("🤖 AI Lab Assistant")
+    st.markdown("Analyze documents and get instant scientific answers.")
+    
+    # Knowledge Base Status. The website is crawled by the background refresher; this page only reads its output
+    kb_snapshot = kb_cache.get_snapshot(PDF_DIR)
+    refresher = kb_refresh.get_scheduler(PDF_DIR)
+    with st.expander(f"📚 Knowledge Base Status ({len(kb_snapshot.files)} text sources)", expanded=False):
+        st.caption(refresher.status())
+        if kb_snapshot.files:
+            for t in kb_snapshot.files:
+                st.text(f"📄 {t.name} ({len(t.chunks)} chunks, ~{t.tokens:,} tokens)")
+        else:
+            st.warning("No text sources found in knowledge_base directory.")
+
+    st.markdown("---")
+    
+    with st.form("ai_query_form"):
+        query = st.text_area("Research Query", placeholder="Enter your question here based on the knowledge base...", height=100)
+        submit_btn = st.form_submit_button("Generate Analysis")
+
+    answer_cache = response_cache.get_cache()
+    similar_cache = semantic_cache.get_cache()
+    if submit_btn and query:
+        try:
+            kb_snapshot = kb_cache.get_snapshot(PDF_DIR)
+            kb_version = kb_snapshot.version
+            cache_key = response_cache.make_key(query, kb_version, MODEL_NAME, generation_config)
+            lookup_start = time.perf_counter()
+            cached_answer = answer_cache.get(cache_key)
+            cache_note = "⚡ Cached answer"
+            
+            if cached_answer is None:
+                # Second tier: reuse the answer to a near-duplicate question
+                if similar_cache.kb_version != kb_version:
+                    similar_cache.warm(answer_cache.entries(kb_version), kb_version)
+                match = similar_cache.lookup(query, kb_version)
+                if match:
+                    cached_answer, matched_query, score = match
+                    cache_note = f"⚡ Cached answer for a similar question (\"{matched_query}\", {score:.0%} match)"
+            
+            if cached_answer is not None:
+                st.markdown("### 💡 Analysis Result")
+                st.markdown(f'<div class="res-card">{cached_answer}</div>', unsafe_allow_html=True)
+                st.caption(f"{cache_note} · {(time.perf_counter() - lookup_start) * 1000:.1f} ms")
+            else:
+                # The static prefix (instructions + knowledge base) is registered once per
+                # knowledge-base version, so each call only sends the question
+                question_parts = [{'text': f"User question: {query}"}]
+                answer_model, parts = get_model(), None
+                corpus = prefix_context(kb_snapshot, query, "AI Lab")  # Boilerplate lines kept once
+                if corpus is not None and kb_cache.estimate_tokens(corpus) >= CONTEXT_CACHE_MIN_TOKENS:
+                    try:
+                        answer_model = get_prefix_cache().get(
+                            kb_version, lambda: [{'text': build_system_context(corpus)}]
+                        )
+                        parts = question_parts
+                    except Exception as e:
+                        print(f"Context caching unavailable, sending retrieved context instead: {e}")
+                if parts is None:
+                    # Only the knowledge-base chunks most relevant to the question are sent
+                    context = retrieved_context(query, "AI Lab")
+                    parts = [{'text': build_system_context(context)}] + question_parts
+                
+                st.markdown("### 💡 Analysis Result")
+                answer_box = st.empty()
+                answer_box.markdown('<div class="res-card">🤖 Analyzing documents and generating response...</div>', unsafe_allow_html=True)
+                # Render tokens into the card as they arrive
+                # The gateway rate-limits, retries and shares identical in-flight questions
+                answer, ttft, total = stream_response(
+                    llm_gateway.get_gateway().stream(answer_model, parts, key=cache_key),
+                    lambda text: answer_box.markdown(f'<div class="res-card">{text}</div>', unsafe_allow_html=True),
+                )
+                if answer:
+                    answer_cache.put(cache_key, query, answer, kb_version)
+                    similar_cache.add(query, answer, kb_version)
+                print(f"AI Lab answer: first token {ttft:.2f}s, total {total:.2f}s, {len(answer)} chars")
+                st.caption(f"⏱️ First token in {ttft:.2f}s · Complete in {total:.2f}s")
+        except Exception as e:
+            st.error(f"Analysis Failed: {str(e)}")
+    
+    cache_stats = answer_cache.stats()
+    similar_stats = similar_cache.stats()
+    st.caption(
+        f"Response cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · {cache_stats['entries']} stored answers"
+        f" | Similar-question cache: {similar_stats['hits']} hits · {similar_stats['misses']} misses"
+        f" (threshold {similar_stats['threshold']:.2f})"
+    )
@@ -0,0 +1,49 @@
+import streamlit as st
+
+import symbolic_engine
+
+def render():
+    """Algebraic Engine: factoring and roots of polynomials."""
+    st.title("➗ Algebraic Engine")
+    st.markdown("Factorize polynomials and find roots instantly.")
+    
+    col_in, col_act = st.columns([3, 1])
+    with col_in:
+        poly = st.text_input("Polynomial Expression", "x^2 - 5x + 6", help="Use ^ or ** for powers; multiplication can be implicit, e.g. 3x(x+1).")
+    with col_act:
+        solve_btn = st.button("Analyze", use_container_width=True)
+    exact_roots = st.checkbox(
+        "Exact symbolic roots", value=False,
+        help=f"Polynomials of degree above {symbolic_engine.EXACT_MAX_DEGREE} get fast numeric roots unless this is checked.",
+    )
+
+    if solve_btn:
+        try:
+            # Parsing, factoring and solving run in time- and memory-limited worker processes
+            analysis = symbolic_engine.analyze_polynomial(poly, exact=exact_roots)
+            st.markdown("### Analysis Results")
+            
+            c1, c2 = st.columns(2)
+            with c1:
+                st.markdown('<div class="metric-container"><div class="metric-label">Factored Form</div>', unsafe_allow_html=True)
+                if analysis['factored'] is not None:
+                    st.latex(analysis['factored'])
+                else:
+                    st.latex(analysis['latex'])
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with c2:
+                label = "Roots (numeric)" if analysis['numeric'] else "Roots"
+                st.markdown(f'<div class="metric-container"><div class="metric-label">{label}</div>', unsafe_allow_html=True)
+                if analysis['roots'] is not None:
+                    st.latex(", ".join(analysis['roots']) or r"\text{No roots found}")
+                else:
+                    st.write("Not available")
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            for note in analysis['notes']:
+                st.warning(note)
+        except symbolic_engine.EngineBusy as e:
+            st.error(str(e))
+        except Exception as e: 
+            st.error(f"Could not read the expression: {e}")
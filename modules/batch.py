@@ -0,0 +1,58 @@
+import time
+
+import streamlit as st
+
+import formulas
+
+BATCH_PREVIEW_ROWS = 1000
+
+def _compute(calculator, data):
+    """Parse and evaluate a table; returns (output columns, results, invalid rows, parse seconds, evaluate seconds)."""
+    start = time.perf_counter()
+    columns, values = formulas.read_table(data)
+    parsed = time.perf_counter()
+    out_columns, results, invalid = formulas.evaluate(calculator, columns, values)
+    return out_columns, results, invalid, parsed - start, time.perf_counter() - parsed
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def run_batch(calculator, data):
+    """Evaluate a calculator over an uploaded or pasted table; cached per input so reruns are free."""
+    out_columns, results, invalid, parse_elapsed, evaluate_elapsed = _compute(calculator, data)
+    return out_columns, results[:BATCH_PREVIEW_ROWS], len(results), invalid, parse_elapsed, evaluate_elapsed
+
+@st.cache_data(show_spinner="Preparing the CSV file...", max_entries=2)
+def batch_csv(calculator, data):
+    """The full results as CSV bytes; formatting every row costs more than computing it, so this only runs on request."""
+    out_columns, results = _compute(calculator, data)[:2]
+    return formulas.to_csv(out_columns, results)
+
+def render_batch(calculator, key):
+    """Batch mode UI: table in, vectorized results and a CSV download out."""
+    inputs = formulas.CALCULATORS[calculator][1]
+    st.caption(f"Columns: {', '.join(inputs)}. The header row is optional; values may be separated by commas, semicolons, tabs or spaces.")
+    upload = st.file_uploader("Upload a CSV file", type=["csv", "tsv", "txt"], key=f"{key}_upload")
+    pasted = st.text_area("...or paste a table", key=f"{key}_paste", height=150)
+    data = upload.getvalue() if upload is not None else pasted.encode('utf-8')
+    if not data.strip():
+        return
+    try:
+        columns, preview, rows, invalid, parse_elapsed, evaluate_elapsed = run_batch(calculator, data)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    st.caption(
+        f"{rows:,} rows parsed in {parse_elapsed * 1000:.1f} ms and computed in {evaluate_elapsed * 1000:.1f} ms"
+        + (f" ({invalid:,} rows had missing or invalid inputs)" if invalid else "")
+    )
+    st.dataframe({name: preview[:, i] for i, name in enumerate(columns)}, use_container_width=True)
+    if rows > len(preview):
+        st.caption(f"Showing the first {len(preview):,} rows; the download contains all of them.")
+    # The CSV is built when asked for, and stays available until the input changes
+    requested_key = f"{key}_csv_for"
+    if st.button("Prepare CSV download", key=f"{key}_prepare", use_container_width=True):
+        st.session_state[requested_key] = hash(data)
+    if st.session_state.get(requested_key) == hash(data):
+        st.download_button(
+            "Download results (CSV)", batch_csv(calculator, data), file_name=f"{key}_results.csv",
+            mime="text/csv", key=f"{key}_download", use_container_width=True,
+        )
@@ -0,0 +1,42 @@
+import streamlit as st
+import sympy as sp
+
+from expr_parser import ParseError, parse_number
+from modules.batch import render_batch
+
+def render():
+    """Circle Equation Solver: the expanded equation of a circle from its center and radius."""
+    st.title("⭕ Circle Equation Solver")
+    st.markdown("Generate standard circle equations from center and radius.")
+    
+    col_eq, col_input = st.columns([1, 1])
+    with col_eq:
+        st.info("Standard Form")
+        st.latex(r"(x - a)^2 + (y - b)^2 = r^2")
+    
+    with col_input:
+        c1, c2 = st.columns(2)
+        exact_help = "Accepts exact values such as 3/2, -sqrt(2) or 2pi."
+        a_in = c1.text_input("Center x (a)", "0", help=exact_help)
+        b_in = c2.text_input("Center y (b)", "0", help=exact_help)
+        r_in = st.text_input("Radius (r)", "1", help=exact_help)
+        
+        solve = st.button("Generate Equation", use_container_width=True)
+
+    if solve:
+        try:
+            a_v, b_v, r_v = (parse_number(v) for v in (a_in, b_in, r_in))
+            if not (r_v.is_real and r_v.is_positive):
+                raise ParseError("The radius must be a positive real number.")
+            x, y = sp.symbols('x y')
+            eq = sp.expand(sp.Eq((x - a_v)**2 + (y - b_v)**2, r_v**2))
+            st.markdown("### Result")
+            st.markdown('<div class="res-card" style="text-align: center;">', unsafe_allow_html=True)
+            st.latex(sp.latex(eq))
+            st.markdown('</div>', unsafe_allow_html=True)
+        except ParseError as e:
+            st.error(f"Invalid input: {e}")
+
+    with st.expander("Batch Mode"):
+        st.markdown(r"Coefficients of $x^2 + y^2 + Dx + Ey + F = 0$ for a table of centers $(a, b)$ and radii $r$.")
+        render_batch("Circle Equation", "circle_equation")
@@ -0,0 +1,84 @@
+import streamlit as st
+
+import formulas
+from modules.batch import render_batch
+
+def render():
+    """Geometry Suite: areas, perimeters and volumes of 2D and 3D shapes."""
+    st.title("📐 Geometry Suite")
+    st.markdown("Perform calculations on 2D and 3D geometric shapes.")
+    
+    tab1, tab2, tab3 = st.tabs(["🟦 2D Plane Geometry", "🧊 3D Solid Geometry", "📄 Batch Mode"])
+    with tab1:
+        shape_2d = st.selectbox("Select 2D Shape", ["Circle", "Rectangle", "Triangle"])
+        st.markdown("---")
+        
+        if shape_2d == "Circle":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                r = st.number_input("Radius", min_value=0.0, step=0.1)
+                calc = st.button("Calculate", key="2d_c", use_container_width=True)
+            with col_res:
+                if calc:
+                    c1, c2 = st.columns(2)
+                    c1.markdown(f'<div class="metric-container"><div class="metric-label">Area</div><div class="metric-value">{formulas.circle(r)["area"]:.4f}</div></div>', unsafe_allow_html=True)
+                    c2.markdown(f'<div class="metric-container"><div class="metric-label">Circumference</div><div class="metric-value">{formulas.circle(r)["circumference"]:.4f}</div></div>', unsafe_allow_html=True)
+        
+        elif shape_2d == "Rectangle":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                l = st.number_input("Length", min_value=0.0, step=0.1)
+                w = st.number_input("Width", min_value=0.0, step=0.1)
+                calc = st.button("Calculate", key="2d_r", use_container_width=True)
+            with col_res:
+                if calc:
+                    c1, c2 = st.columns(2)
+                    c1.markdown(f'<div class="metric-container"><div class="metric-label">Area</div><div class="metric-value">{formulas.rectangle(l, w)["area"]:.4f}</div></div>', unsafe_allow_html=True)
+                    c2.markdown(f'<div class="metric-container"><div class="metric-label">Perimeter</div><div class="metric-value">{formulas.rectangle(l, w)["perimeter"]:.4f}</div></div>', unsafe_allow_html=True)
+        
+        elif shape_2d == "Triangle":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                b = st.number_input("Base", min_value=0.0, step=0.1)
+                h = st.number_input("Height", min_value=0.0, step=0.1)
+                calc = st.button("Calculate", key="2d_t", use_container_width=True)
+            with col_res:
+                if calc:
+                    st.markdown(f'<div class="metric-container"><div class="metric-label">Area</div><div class="metric-value">{formulas.triangle(b, h)["area"]:.4f}</div></div>', unsafe_allow_html=True)
+
+    with tab2:
+        shape_3d = st.selectbox("Select 3D Shape", ["Sphere", "Cube", "Cylinder"])
+        st.markdown("---")
+        
+        if shape_3d == "Sphere":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                r3 = st.number_input("Radius", min_value=0.0, step=0.1, key="3d_s_r")
+                calc = st.button("Calculate", key="3d_s", use_container_width=True)
+            with col_res:
+                if calc:
+                    st.markdown(f'<div class="metric-container"><div class="metric-label">Volume</div><div class="metric-value">{formulas.sphere(r3)["volume"]:.2f}</div></div>', unsafe_allow_html=True)
+        
+        elif shape_3d == "Cube":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                s = st.number_input("Side Length", min_value=0.0, step=0.1)
+                calc = st.button("Calculate", key="3d_cb", use_container_width=True)
+            with col_res:
+                if calc:
+                    st.markdown(f'<div class="metric-container"><div class="metric-label">Volume</div><div class="metric-value">{formulas.cube(s)["volume"]:.2f}</div></div>', unsafe_allow_html=True)
+        
+        elif shape_3d == "Cylinder":
+            col_in, col_res = st.columns([1, 2])
+            with col_in:
+                rc = st.number_input("Radius", min_value=0.0, step=0.1, key="cyl_r")
+                hc = st.number_input("Height", min_value=0.0, step=0.1, key="cyl_h")
+                calc = st.button("Calculate", key="3d_cyl", use_container_width=True)
+            with col_res:
+                if calc:
+                    st.markdown(f'<div class="metric-container"><div class="metric-label">Volume</div><div class="metric-value">{formulas.cylinder(rc, hc)["volume"]:.2f}</div></div>', unsafe_allow_html=True)
+
+    with tab3:
+        batch_shape = st.selectbox("Select Shape", ["Circle", "Rectangle", "Triangle", "Sphere", "Cube", "Cylinder"], key="batch_shape")
+        st.markdown("---")
+        render_batch(batch_shape, f"geometry_{batch_shape.lower()}")
@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+import formulas
+from modules.batch import render_batch
+
+TRAJECTORY_MAX_POINTS = 5_000_000
+TRAJECTORY_CHART_POINTS = 2000  # Per series, after LTTB downsampling
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def trajectory_chart(u, a, t_start, t_end, points):
+    """Sample a trajectory and downsample it for the browser; returns (chart columns, compute time)."""
+    start = time.perf_counter()
+    t, v, s = formulas.trajectory(u, a, t_start, t_end, points)
+    keep = formulas.downsample(t, (v, s), TRAJECTORY_CHART_POINTS)
+    return {'t': t[keep], 'v': v[keep], 's': s[keep]}, time.perf_counter() - start
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def trajectory_csv(u, a, t_start, t_end, points):
+    """The full-resolution trajectory as CSV bytes."""
+    t, v, s = formulas.trajectory(u, a, t_start, t_end, points)
+    return formulas.to_csv(['t', 'v', 's'], np.column_stack((t, v, s)))
+
+def render():
+    """Motion Calculator: velocity and displacement under constant acceleration."""
+    st.title("🏃 Motion Calculator")
+    st.markdown("Calculate velocity and displacement using kinematic equations.")
+    
+    with st.expander("Formula Sheet", expanded=True):
+        st.latex(r"v = u + at \quad | \quad s = ut + \frac{1}{2}at^2")
+    
+    col_inputs, col_res = st.columns([1, 1])
+    with col_inputs:
+        u = st.number_input("Initial Velocity (u)", value=0.0)
+        a = st.number_input("Acceleration (a)", value=9.8)
+        t = st.number_input("Time (t)", value=1.0)
+        calc = st.button("Calculate Motion", use_container_width=True)
+    
+    with col_res:
+        if calc:
+            motion = formulas.kinematics(u, a, t)
+            v, s = motion['v'], motion['s']
+            st.markdown(f'<div class="metric-container"><div class="metric-label">Final Velocity (v)</div><div class="metric-value">{v:.2f} m/s</div></div>', unsafe_allow_html=True)
+            st.markdown('<div style="height: 10px"></div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-container"><div class="metric-label">Displacement (s)</div><div class="metric-value">{s:.2f} m</div></div>', unsafe_allow_html=True)
+
+    with st.expander("Batch Mode"):
+        st.markdown("Final velocity and displacement for a table of $u$, $a$ and $t$ values.")
+        render_batch("Kinematics", "kinematics")
+
+    with st.expander("Trajectory"):
+        st.markdown("Sample $v(t)$ and $s(t)$ over a time range using the velocity and acceleration above.")
+        c1, c2, c3 = st.columns(3)
+        t_start = c1.number_input("Start time", value=0.0, key="traj_t0")
+        t_end = c2.number_input("End time", value=10.0, key="traj_t1")
+        points = c3.number_input("Samples", min_value=2, max_value=TRAJECTORY_MAX_POINTS, value=10000, step=1000, key="traj_n")
+        if t_end <= t_start:
+            st.error("End time must be after start time.")
+        else:
+            chart, elapsed = trajectory_chart(u, a, t_start, t_end, int(points))
+            st.caption(f"{int(points):,} samples computed in {elapsed * 1000:.1f} ms; plotting {len(chart['t']):,} of them.")
+            st.line_chart(chart, x="t", y=["v", "s"])
+            if st.checkbox("Export the full series", key="traj_export"):
+                st.download_button(
+                    "Download trajectory (CSV)", trajectory_csv(u, a, t_start, t_end, int(points)),
+                    file_name="trajectory.csv", mime="text/csv", use_container_width=True,
+                )
@@ -0,0 +1,66 @@
+import streamlit as st
+
+import prob_engine
+
+def render():
+    """Probability & Series: counting and binomial or hypergeometric probabilities."""
+    st.title("📊 Probability & Series")
+    st.markdown("Calculate permutations, combinations and binomial or hypergeometric probabilities.")
+    
+    col_op, col_val = st.columns([1, 2])
+    with col_op:
+        mode = st.radio("Operation", ["nCr (Combination)", "nPr (Permutation)", "Binomial Probability", "Hypergeometric Probability"])
+    
+    with col_val:
+        c1, c2 = st.columns(2)
+        if mode in ("nCr (Combination)", "nPr (Permutation)"):
+            n = c1.number_input("Total Set (n)", min_value=0, max_value=prob_engine.MAX_N, value=5)
+            r = c2.number_input("Selection (r)", min_value=0, max_value=prob_engine.MAX_N, value=2)
+        elif mode == "Binomial Probability":
+            n = c1.number_input("Trials (n)", min_value=0, max_value=prob_engine.MAX_N, value=10)
+            k = c2.number_input("Successes (k)", min_value=0, max_value=prob_engine.MAX_N, value=3)
+            p = st.number_input("Success probability (p)", min_value=0.0, max_value=1.0, value=0.5, step=0.05)
+        else:
+            n = c1.number_input("Population (N)", min_value=0, max_value=prob_engine.MAX_N, value=52)
+            K = c2.number_input("Marked items (K)", min_value=0, max_value=prob_engine.MAX_N, value=4)
+            draws = c1.number_input("Draws (n)", min_value=0, max_value=prob_engine.MAX_N, value=5)
+            k = c2.number_input("Marked items drawn (k)", min_value=0, max_value=prob_engine.MAX_N, value=1)
+        calc_btn = st.button("Calculate", use_container_width=True)
+        
+    if calc_btn:
+        try:
+            if mode in ("nCr (Combination)", "nPr (Permutation)"):
+                # Exact integers only up to a bounded size; larger results come from log-gamma
+                res = prob_engine.comb(n, r) if mode == "nCr (Combination)" else prob_engine.perm(n, r)
+                st.markdown(f'<div class="metric-container"><div class="metric-label">Result</div><div class="metric-value">{res["scientific"]}</div></div>', unsafe_allow_html=True)
+                st.caption(f"{res['digits']:,} digits" + ("" if res['exact'] else " (approximate, computed in log space)"))
+                if res['exact'] and res['digits'] > prob_engine.DISPLAY_MAX_DIGITS:
+                    with st.expander("Exact value"):
+                        st.code(str(res['value']))
+                if n <= prob_engine.FACTOR_MAX_N:
+                    with st.expander("Prime factorization"):
+                        factors = prob_engine.prime_factorization(n, r, permutation=mode == "nPr (Permutation)")
+                        shown = factors[:200]
+                        st.latex(r" \cdot ".join(f"{q}^{{{e}}}" if e > 1 else str(q) for q, e in shown) or "1")
+                        if len(factors) > len(shown):
+                            st.caption(f"Showing the first {len(shown)} of {len(factors):,} prime factors.")
+            else:
+                if mode == "Binomial Probability":
+                    exact = prob_engine.binomial_pmf(k, n, p)
+                    log_exact = float(prob_engine.binomial_log_pmf(k, n, p)) if 0 <= k <= n else None
+                    cdf = lambda: prob_engine.binomial_cdf(k, n, p)
+                else:
+                    exact = prob_engine.hypergeometric_pmf(k, n, K, draws)
+                    log_exact = None
+                    cdf = lambda: prob_engine.hypergeometric_cdf(k, n, K, draws)
+                try:
+                    cumulative, cdf_note = prob_engine.format_probability(cdf()), None
+                except prob_engine.ProbabilityError as e:
+                    cumulative, cdf_note = "n/a", str(e)
+                c1, c2 = st.columns(2)
+                c1.markdown(f'<div class="metric-container"><div class="metric-label">P(X = k)</div><div class="metric-value">{prob_engine.format_probability(exact, log_exact)}</div></div>', unsafe_allow_html=True)
+                c2.markdown(f'<div class="metric-container"><div class="metric-label">P(X ≤ k)</div><div class="metric-value">{cumulative}</div></div>', unsafe_allow_html=True)
+                if cdf_note:
+                    st.caption(cdf_note)
+        except prob_engine.ProbabilityError as e:
+            st.error(str(e))
@@ -0,0 +1,71 @@
+import time
+
+import streamlit as st
+
+import kb_cache
+import llm_gateway
+import response_cache
+import site_search
+from bootstrap import PDF_DIR
+from modules.ai_common import (
+    MODEL_NAME, build_system_context, generation_config, get_model, retrieved_context, stream_response,
+)
+
+def render():
+    """Site Info Guide: team, contact and site questions answered from a local index."""
+    st.title("🔬 Site Information Guide")
+    st.markdown("Quickly find details about our team and how to reach us.")
+    
+    with st.container():
+        col_search, col_btn = st.columns([4, 1])
+        with col_search:
+            query = st.text_input("Information Search", placeholder="Ask about the team, contact details or anything on the site...", label_visibility="collapsed").strip()
+        with col_btn:
+            info_btn = st.button("Search", key="info_send", use_container_width=True)
+
+    if info_btn and query:
+        # Answered from an inverted index over the knowledge base; only queries it cannot
+        # answer are sent to the model
+        lookup_start = time.perf_counter()
+        site_index = site_search.get_index(PDF_DIR)
+        result = site_index.answer(query)
+        lookup_ms = (time.perf_counter() - lookup_start) * 1000
+        st.markdown('<div class="res-card">', unsafe_allow_html=True)
+        if result['intent'] == 'greeting':
+            st.success(f"👋 Hello {st.session_state['user_info'].get('given_name')}! I'm the Bubloo Scientist assistant. How can I help you?")
+        elif result['intent'] == 'team':
+            st.markdown("### 👥 The Executive Team")
+            st.markdown("\n".join(f"* **{name}** - {role}" for name, role in site_index.team))
+        elif result['intent'] == 'contact':
+            st.markdown("### 📬 Contact Details")
+            for label, value in site_index.contact_details():
+                icon = "📧" if "mail" in label.lower() else "🌐" if "web" in label.lower() else "📌"
+                st.markdown(f"{icon} **{label}:** {value}")
+        elif result['answered']:
+            st.markdown("### 🔎 From the site")
+            for _, source, snippet, _ in result['snippets']:
+                st.markdown(site_search.highlight(snippet, query))
+                st.caption(source)
+        else:
+            kb_version = kb_cache.get_snapshot(PDF_DIR).version
+            cache_key = response_cache.make_key(query, kb_version, MODEL_NAME, generation_config)
+            answer = response_cache.get_cache().get(cache_key)
+            if answer is not None:
+                st.markdown(answer)
+            else:
+                answer_box = st.empty()
+                answer_box.markdown("🤖 Not found on the site, asking the AI assistant...")
+                try:
+                    context = retrieved_context(query, "Site Info")
+                    parts = [{'text': build_system_context(context)}, {'text': f"User question: {query}"}]
+                    answer, _, _ = stream_response(
+                        llm_gateway.get_gateway().stream(get_model(), parts, key=cache_key), answer_box.markdown,
+                    )
+                    if answer:
+                        response_cache.get_cache().put(cache_key, query, answer, kb_version)
+                except Exception as e:
+                    answer_box.info("💡 Try searching for **'team'** or **'contact'**.")
+                    print(f"Site Info fallback failed: {e}")
+        st.markdown('</div>', unsafe_allow_html=True)
+        if result['answered']:
+            st.caption(f"⚡ Answered from the site index in {lookup_ms:.2f} ms")
@@ -0,0 +1,99 @@
+import numpy as np
+
+NEWTON_STEPS = 3
+# Relative size below which an imaginary (or real) part is shown as zero. A root of multiplicity
+# m is only accurate to about eps**(1/m) (1e-8 for double roots, 6e-6 for triple ones), so a
+# smaller tolerance would print spurious "± 7e-09 i" parts on repeated real roots.
+REAL_TOLERANCE = 1e-5
+
+def trim_coefficients(coeffs):
+    """Drop leading zero coefficients (highest degree first)."""
+    coeffs = np.asarray(coeffs, dtype=complex)
+    nonzero = np.flatnonzero(coeffs)
+    if nonzero.size == 0:
+        raise ValueError("The zero polynomial has no finite set of roots.")
+    return coeffs[nonzero[0]:]
+
+def companion_matrix(coeffs):
+    """Companion matrix whose eigenvalues are the roots of the monic polynomial."""
+    coeffs = coeffs / coeffs[0]
+    degree = len(coeffs) - 1
+    matrix = np.zeros((degree, degree), dtype=complex)
+    matrix[0, :] = -coeffs[1:]
+    matrix[1:, :-1] = np.eye(degree - 1)
+    return matrix
+
+def newton_refine(coeffs, roots, steps=NEWTON_STEPS):
+    """Polish approximate roots with a few vectorized Newton steps.
+
+    A step is kept only where it is finite and lowers |p(root)|; near multiple roots Newton
+    can move away from the eigenvalue or overflow, and the eigenvalue is kept instead.
+    """
+    derivative = np.polyder(coeffs)
+    with np.errstate(all='ignore'):
+        residual = np.abs(np.polyval(coeffs, roots))
+        for _ in range(steps):
+            slope = np.polyval(derivative, roots)
+            step = np.polyval(coeffs, roots) / np.where(slope != 0, slope, 1)
+            candidate = np.where(slope != 0, roots - step, roots)
+            candidate_residual = np.abs(np.polyval(coeffs, candidate))
+            better = np.isfinite(candidate) & (candidate_residual < residual)
+            roots = np.where(better, candidate, roots)
+            residual = np.where(better, candidate_residual, residual)
+    return roots
+
+def roots(coeffs, refine=True):
+    """All complex roots of a polynomial given its coefficients, highest degree first."""
+    coeffs = trim_coefficients(coeffs)
+    # Roots at zero come from trailing zero coefficients; removing them keeps the matrix well-conditioned
+    nonzero = np.flatnonzero(coeffs)
+    zeros = len(coeffs) - 1 - nonzero[-1]
+    coeffs = coeffs[:nonzero[-1] + 1]
+    if len(coeffs) == 1:
+        found = np.empty(0, dtype=complex)
+    else:
+        found = np.linalg.eigvals(companion_matrix(coeffs))
+        if refine:
+            found = newton_refine(coeffs, found)
+    return np.concatenate([found, np.zeros(zeros, dtype=complex)])
+
+def batch_roots(polynomials, refine=True):
+    """Roots of many polynomials at once.
+
+    Polynomials of equal degree are solved together with one stacked eigenvalue call.
+    Returns a list of root arrays in the same order as `polynomials`.
+    """
+    results = [None] * len(polynomials)
+    groups = {}
+    for i, coeffs in enumerate(polynomials):
+        coeffs = trim_coefficients(coeffs)
+        if len(coeffs) < 2 or coeffs[-1] == 0:
+            results[i] = roots(coeffs, refine)  # Constants and roots at zero take the single path
+        else:
+            groups.setdefault(len(coeffs), []).append((i, coeffs))
+
+    for size, members in groups.items():
+        stacked = np.stack([c / c[0] for _, c in members])
+        degree = size - 1
+        matrices = np.zeros((len(members), degree, degree), dtype=complex)
+        matrices[:, 0, :] = -stacked[:, 1:]
+        matrices[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+        found = np.linalg.eigvals(matrices)
+        for (i, coeffs), row in zip(members, found):
+            results[i] = newton_refine(coeffs, row) if refine else row
+    return results
+
+def format_root(root, digits=6):
+    """LaTeX for a numeric root, dropping a negligible imaginary part."""
+    real, imag = root.real, root.imag
+    scale = max(1.0, abs(root))
+    if abs(imag) <= REAL_TOLERANCE * scale:
+        return f"{real:.{digits}g}"
+    if abs(real) <= REAL_TOLERANCE * scale:
+        return f"{imag:.{digits}g} i"
+    sign = "+" if imag >= 0 else "-"
+    return f"{real:.{digits}g} {sign} {abs(imag):.{digits}g} i"
+
+def sort_roots(found):
+    """Order roots by real part, then imaginary part, for stable display."""
+    return sorted(found, key=lambda r: (round(r.real, 9), round(r.imag, 9)))
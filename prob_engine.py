@@ -0,0 +1,249 @@
+import math
+from functools import lru_cache
+
+import mpmath
+import numpy as np
+
+EXACT_MAX_DIGITS = 4000       # Larger results are computed in log space only (str() of an int stops at 4300 digits)
+DISPLAY_MAX_DIGITS = 40       # Longer exact values are shown in scientific notation
+SIGNIFICANT_DIGITS = 10
+LOG_TABLE_SIZE = 1_000_000    # log(k!) is tabulated for k below this
+FACTOR_MAX_N = 10_000_000     # Prime factorizations are offered up to this n
+MAX_N = 10**15                # Beyond this the float inputs themselves are no longer exact
+
+class ProbabilityError(ValueError):
+    """Raised for arguments outside a function's domain or supported range."""
+
+# --- Cached tables ---
+
+@lru_cache(maxsize=1)
+def _log_factorial_table():
+    table = np.zeros(LOG_TABLE_SIZE)
+    np.cumsum(np.log(np.arange(1, LOG_TABLE_SIZE)), out=table[1:])
+    return table
+
+def log_factorial(n):
+    """Natural log of n! for an integer or an integer array."""
+    if np.ndim(n) == 0:
+        return float(_log_factorial_table()[n]) if n < LOG_TABLE_SIZE else math.lgamma(n + 1)
+    n = np.asarray(n)
+    if n.size and n.max() >= LOG_TABLE_SIZE:
+        return np.array([log_factorial(int(k)) for k in n.ravel()]).reshape(n.shape)
+    return _log_factorial_table()[n]
+
+@lru_cache(maxsize=512)
+def factorial(n):
+    """Exact n!, memoized (only called for results below EXACT_MAX_DIGITS digits)."""
+    return math.factorial(n)
+
+@lru_cache(maxsize=4)
+def primes_up_to(limit):
+    """All primes <= limit (sieve of Eratosthenes), cached per limit."""
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = False
+    return np.flatnonzero(sieve)
+
+def _sieve_limit(n):
+    # Round up so nearby n reuse one cached sieve
+    return max(1000, 1 << max(0, n - 1).bit_length())
+
+def factorial_exponents(n, primes):
+    """Exponent of each prime in n! (Legendre's formula), vectorized over `primes`."""
+    exponents = np.zeros(len(primes), dtype=np.int64)
+    power = primes.astype(np.int64)
+    while True:
+        mask = power <= n
+        if not mask.any():
+            return exponents
+        exponents[mask] += n // power[mask]
+        power = np.where(mask, power * primes, n + 1)
+
+# --- Results ---
+
+def _check(n, r):
+    if n < 0 or r < 0:
+        raise ProbabilityError("n and r must be non-negative.")
+    if r > n:
+        raise ProbabilityError("Selection (r) cannot be larger than Total Set (n).")
+    if n > MAX_N:
+        raise ProbabilityError(f"n is limited to {MAX_N:.0e}.")
+
+def format_scientific(log10_value, significant=SIGNIFICANT_DIGITS):
+    """'1.234 × 10^5678' from the base-10 logarithm of a positive number."""
+    with mpmath.workdps(significant + 25):
+        log10_value = mpmath.mpf(log10_value)
+        exponent = int(mpmath.floor(log10_value))
+        mantissa = mpmath.nstr(mpmath.power(10, log10_value - exponent), significant, strip_zeros=True)
+    if mantissa.startswith("10"):  # Rounded up to the next power of ten
+        mantissa, exponent = "1", exponent + 1
+    if "." in mantissa:
+        mantissa = mantissa.rstrip("0").rstrip(".")
+    return mantissa if exponent == 0 else f"{mantissa} × 10^{exponent}"
+
+def _result(log10_value, exact_value):
+    """Shared result shape for counts: exact value when small enough, scientific notation always."""
+    if exact_value is not None:
+        digits = len(str(exact_value))
+        text = f"{exact_value:,}" if digits <= DISPLAY_MAX_DIGITS else format_scientific(mpmath.log10(exact_value))
+    else:
+        digits = int(mpmath.floor(log10_value)) + 1
+        text = format_scientific(log10_value)
+    return {'value': exact_value, 'exact': exact_value is not None, 'digits': digits, 'scientific': text}
+
+def _log10_ratio(numerator, *denominators):
+    """log10(numerator! / prod(denominator!)) at enough precision for a correct mantissa."""
+    with mpmath.workdps(30 + len(str(numerator))):
+        total = mpmath.loggamma(numerator + 1) - sum(mpmath.loggamma(d + 1) for d in denominators)
+        return total / mpmath.ln(10)
+
+@lru_cache(maxsize=1024)
+def comb(n, r):
+    """C(n, r): exact when it has at most EXACT_MAX_DIGITS digits, otherwise from log-gamma.
+
+    Returns a dict with 'value' (int or None), 'exact', 'digits' and 'scientific'.
+    """
+    _check(n, r)
+    r = min(r, n - r)
+    if r == 0:
+        return _result(0, 1)
+    log10_value = _log10_ratio(n, r, n - r)
+    exact = math.comb(n, r) if log10_value < EXACT_MAX_DIGITS else None
+    return _result(log10_value, exact)
+
+@lru_cache(maxsize=1024)
+def perm(n, r):
+    """P(n, r) = n! / (n - r)!, with the same exact/approximate split and result as comb()."""
+    _check(n, r)
+    if r == 0:
+        return _result(0, 1)
+    log10_value = _log10_ratio(n, n - r)
+    if log10_value >= EXACT_MAX_DIGITS:
+        return _result(log10_value, None)
+    exact = factorial(n) // factorial(n - r) if n < 2000 else math.perm(n, r)
+    return _result(log10_value, exact)
+
+def prime_factorization(n, r, permutation=False):
+    """Prime factorization of C(n, r) (or P(n, r)) as a list of (prime, exponent) pairs."""
+    _check(n, r)
+    if n > FACTOR_MAX_N:
+        raise ProbabilityError(f"Factorizations are limited to n <= {FACTOR_MAX_N:,}.")
+    primes = primes_up_to(_sieve_limit(n))
+    primes = primes[primes <= n]
+    exponents = factorial_exponents(n, primes) - factorial_exponents(n - r, primes)
+    if not permutation:
+        exponents -= factorial_exponents(r, primes)
+    keep = exponents > 0
+    return list(zip(primes[keep].tolist(), exponents[keep].tolist()))
+
+# --- Probability distributions (log space, so they neither overflow nor lose small values) ---
+
+def _check_probability(p):
+    if not 0 <= p <= 1:
+        raise ProbabilityError("p must be between 0 and 1.")
+
+def _log_comb(n, k):
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
+
+def _xlogy(x, y):
+    """x * log(y) with 0 * log(0) = 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(x == 0, 0.0, x * np.log(y))
+
+def _xlog1py(x, y):
+    """x * log(1 + y) with 0 * log(0) = 0; exact for tiny y, where 1 + y would round."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(x == 0, 0.0, x * np.log1p(y))
+
+# Beyond the log-factorial table the terms of a log-probability reach ~1e16 and cancel to noise
+# in float64 (binomial_pmf(3, 10**15, 3e-15) came out 0.036 instead of 0.224), so large
+# populations are evaluated with mpmath and only the final logarithm is rounded to a float.
+
+def _mp_log_comb(n, k):
+    return mpmath.loggamma(n + 1) - mpmath.loggamma(k + 1) - mpmath.loggamma(n - k + 1)
+
+def _mp_xlogy(x, y):
+    return mpmath.mpf(0) if x == 0 else x * mpmath.log(y)
+
+def _precise(log_term, n, k):
+    """Evaluate `log_term(k)` at enough precision for sizes up to n, for a scalar or array k."""
+    with mpmath.workdps(30 + len(str(int(n)))):
+        if k.ndim == 0:
+            return float(log_term(int(k)))
+        return np.array([float(log_term(int(j))) for j in k.ravel()]).reshape(k.shape)
+
+def binomial_log_pmf(k, n, p):
+    """Natural log of P(X = k) for X ~ Binomial(n, p); k may be an array."""
+    _check_probability(p)
+    k = np.asarray(k)
+    if n >= LOG_TABLE_SIZE:
+        return _precise(lambda j: _mp_log_comb(n, j) + _mp_xlogy(j, p) + _mp_xlogy(n - j, 1 - mpmath.mpf(p)), n, k)
+    return _log_comb(n, k) + _xlogy(k, p) + _xlog1py(n - k, -p)
+
+def binomial_pmf(k, n, p):
+    """P(X = k) for X ~ Binomial(n, p)."""
+    if not 0 <= k <= n:
+        return 0.0
+    return float(np.exp(binomial_log_pmf(k, n, p)))
+
+def binomial_cdf(k, n, p):
+    """P(X <= k) for X ~ Binomial(n, p), summed in log space over whichever tail is shorter."""
+    if k < 0:
+        return 0.0
+    if k >= n:
+        return 1.0
+    if n >= LOG_TABLE_SIZE:
+        raise ProbabilityError(f"Cumulative probabilities are limited to n < {LOG_TABLE_SIZE:,}.")
+    if k <= n // 2:
+        return float(np.exp(binomial_log_pmf(np.arange(k + 1), n, p)).sum())
+    return float(max(0.0, 1 - np.exp(binomial_log_pmf(np.arange(k + 1, n + 1), n, p)).sum()))
+
+def _check_hypergeometric(population, successes, draws):
+    if not 0 <= successes <= population or not 0 <= draws <= population:
+        raise ProbabilityError("Successes and draws must be between 0 and the population size.")
+
+def hypergeometric_log_pmf(k, population, successes, draws):
+    """Natural log of P(X = k) drawing `draws` items without replacement from `population`
+    items of which `successes` are marked; k may be an array of valid counts."""
+    k = np.asarray(k)
+    if population >= LOG_TABLE_SIZE:
+        return _precise(
+            lambda j: _mp_log_comb(successes, j) + _mp_log_comb(population - successes, draws - j)
+            - _mp_log_comb(population, draws),
+            population, k,
+        )
+    return (
+        _log_comb(successes, k) + _log_comb(population - successes, draws - k)
+        - _log_comb(population, draws)
+    )
+
+def hypergeometric_pmf(k, population, successes, draws):
+    """P(X = k) for the hypergeometric distribution."""
+    _check_hypergeometric(population, successes, draws)
+    if not max(0, draws - (population - successes)) <= k <= min(draws, successes):
+        return 0.0
+    return float(np.exp(hypergeometric_log_pmf(k, population, successes, draws)))
+
+def hypergeometric_cdf(k, population, successes, draws):
+    """P(X <= k) for the hypergeometric distribution."""
+    _check_hypergeometric(population, successes, draws)
+    low, high = max(0, draws - (population - successes)), min(draws, successes)
+    if k < low:
+        return 0.0
+    if k >= high:
+        return 1.0
+    if population >= LOG_TABLE_SIZE:
+        raise ProbabilityError(f"Cumulative probabilities are limited to populations below {LOG_TABLE_SIZE:,}.")
+    return float(min(1.0, np.exp(hypergeometric_log_pmf(np.arange(low, k + 1), population, successes, draws)).sum()))
+
+def format_probability(p, log_p=None):
+    """Readable probability; values that underflow a float are shown from their logarithm."""
+    if p > 0 and p >= 1e-4:
+        return f"{p:.6g}"
+    if p > 0:
+        return format_scientific(math.log10(p), 6)
+    if log_p is not None and np.isfinite(log_p):
+        return format_scientific(log_p / math.log(10), 6)
+    return "0"
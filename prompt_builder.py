@@ -0,0 +1,99 @@
+import os
+import threading
+
+import metrics
+from kb_cache import estimate_tokens
+from site_search import TEAM_FILE
+
+# Input tokens per request (instructions, knowledge-base context and question together)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+# Limit for a prompt whose knowledge-base part is the whole corpus. That corpus is registered once
+# as a cached prefix and billed at the cached rate, so it may be far larger than a per-request
+# prompt; a corpus that does not fit whole is not sent (retrieval is used instead)
+PREFIX_TOKEN_BUDGET = int(os.getenv("PREFIX_TOKEN_BUDGET", "50000"))
+MIN_SECTION_TOKENS = 64  # A section is only cut short if at least this much of it still fits
+TRUNCATION_MARK = "[…]"
+
+_lock = threading.Lock()
+_corpus_cache = {}  # kb version -> (context, report)
+
+def format_section(source, text):
+    return f"\n\n--- Source: {source} ---\n{text}"
+
+def compress(sections, budget=None, reserved=0):
+    """Assemble (source, text) sections, highest priority first, into prompt context.
+
+    A line already present earlier in the context (navigation, footers and other text the
+    scraper sees on every page) is kept only once, and runs of blank lines are collapsed.
+    With a `budget`, sections are added until `budget - reserved` tokens are used: the first
+    one that does not fit is cut at a line boundary and everything after it is left out.
+
+    Returns (context, report) where report counts 'input_tokens', 'tokens', 'saved_tokens',
+    'duplicate_lines', 'truncated' and 'dropped' sections.
+    """
+    limit = None if budget is None else max(0, budget - reserved) * 4  # In characters, as estimate_tokens counts
+    seen = set()
+    parts = []
+    used = 0
+    report = {
+        'input_tokens': sum(estimate_tokens(format_section(source, text)) for source, text in sections),
+        'duplicate_lines': 0, 'truncated': 0, 'dropped': 0,
+    }
+    for position, (source, text) in enumerate(sections):
+        if limit is not None and used >= limit:
+            report['dropped'] = len(sections) - position
+            break
+        lines = []
+        for line in text.splitlines():
+            key = " ".join(line.lower().split())
+            if not key:
+                if lines and lines[-1]:
+                    lines.append("")
+            elif key in seen:
+                report['duplicate_lines'] += 1
+            else:
+                seen.add(key)
+                lines.append(line.rstrip())
+        while lines and not lines[-1]:
+            lines.pop()
+        if not lines:
+            continue  # Nothing left that the context does not already contain
+        section = format_section(source, "\n".join(lines))
+        if limit is not None and used + len(section) > limit:
+            room = limit - used
+            if room < MIN_SECTION_TOKENS * 4:
+                report['dropped'] = len(sections) - position
+                break
+            section = section[:room - len(TRUNCATION_MARK) - 1].rsplit("\n", 1)[0] + "\n" + TRUNCATION_MARK
+            report['truncated'] += 1
+            report['dropped'] = len(sections) - position - 1
+            parts.append(section)
+            break
+        parts.append(section)
+        used += len(section)
+    context = "".join(parts)
+    report['tokens'] = estimate_tokens(context)
+    report['saved_tokens'] = max(0, report['input_tokens'] - report['tokens'])
+    return context, report
+
+def log_report(label, report):
+    print(
+        f"{label} prompt context: {report['input_tokens']:,} -> {report['tokens']:,} tokens"
+        f" (saved {report['saved_tokens']:,}; {report['duplicate_lines']:,} duplicate lines,"
+        f" {report['truncated']} sections truncated, {report['dropped']} dropped)"
+    )
+
+def prioritized_chunks(snapshot):
+    """Knowledge-base chunks with the hand-written team_info.txt first, then in file order."""
+    return sorted(snapshot.chunks, key=lambda chunk: not chunk[0].startswith(TEAM_FILE))
+
+@metrics.timed("kb_corpus_context")
+def corpus_context(snapshot):
+    """The whole knowledge base as prompt context, deduplicated; (context, report) built once per content version."""
+    with _lock:
+        cached = _corpus_cache.get(snapshot.version)
+        if cached is None:
+            cached = compress(prioritized_chunks(snapshot))
+            _corpus_cache.clear()  # Only the current version is ever asked for again
+            _corpus_cache[snapshot.version] = cached
+        return cached
@@ -0,0 +1,86 @@
+import threading
+import time
+
+DEFAULT_TTL = 60 * 60  # Seconds a registered prefix stays alive on the provider
+RETRY_AFTER = 5 * 60   # Seconds to wait before retrying a failed registration
+
+class GeminiContextBackend:
+    """Registers the prefix with Gemini's cached-content API so calls only send the delta."""
+
+    def __init__(self, model_name, generation_config=None):
+        self.model_name = model_name
+        self.generation_config = generation_config
+
+    def create(self, prefix_parts, ttl):
+        import datetime
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        cached = caching.CachedContent.create(
+            model=f"models/{self.model_name}",
+            display_name="bubloo-knowledge-base",
+            contents=[{'role': 'user', 'parts': list(prefix_parts)}],
+            ttl=datetime.timedelta(seconds=ttl),
+        )
+        model = genai.GenerativeModel.from_cached_content(cached, generation_config=self.generation_config)
+        return _GeminiCachedModel(model, cached)
+
+class _GeminiCachedModel:
+    def __init__(self, model, cached):
+        self.model = model
+        self.cached = cached
+
+    def generate_content(self, parts, **kwargs):
+        return self.model.generate_content(parts, **kwargs)
+
+    def release(self):
+        try:
+            self.cached.delete()
+        except Exception as e:
+            print(f"Could not delete cached content {getattr(self.cached, 'name', '')}: {e}")
+
+class PrefixCache:
+    """Registers the static prompt prefix once per knowledge-base version and reuses it.
+
+    get() returns a model-like object whose generate_content() only needs the per-query parts.
+    The prefix is re-registered when the version changes or the registration nears its TTL.
+    `backend.create(prefix_parts, ttl)` returns that object, which also has a release() method.
+    """
+
+    def __init__(self, backend, ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.registrations = 0
+        self.reuses = 0
+        self._lock = threading.Lock()
+        self._version = None
+        self._model = None
+        self._expires = 0.0
+        self._failed_until = 0.0
+
+    def get(self, version, build_prefix):
+        """Return the prefix-bound model for `version`; build_prefix() is only called on registration."""
+        with self._lock:
+            now = time.monotonic()
+            if self._model is not None and self._version == version and now < self._expires:
+                self.reuses += 1
+                return self._model
+
+            if now < self._failed_until:
+                raise RuntimeError("prefix registration failed recently; retrying later")
+            try:
+                model = self.backend.create(build_prefix(), self.ttl)
+            except Exception:
+                self._failed_until = now + RETRY_AFTER
+                raise
+            if self._model is not None:
+                self._model.release()
+            self._model = model
+            self._version = version
+            # Refresh a little before the provider drops the cached content
+            self._expires = now + self.ttl * 0.9
+            self.registrations += 1
+            return model
+
+    def stats(self):
+        return {'version': self._version, 'registrations': self.registrations, 'reuses': self.reuses}
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_DB_FILE = "response_cache.db"
+DEFAULT_TTL = 24 * 60 * 60       # Answers expire after a day
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+_WS_RE = re.compile(r"\s+")
+
+def normalize_query(query):
+    """Normalize a question so trivially different spellings share a cache entry."""
+    query = _WS_RE.sub(" ", query.strip().lower())
+    return query.rstrip("?!. ")
+
+def make_key(query, kb_version, model_name, generation_config):
+    """Build the cache key for a query against one knowledge-base version and model setup."""
+    payload = json.dumps(
+        [normalize_query(query), kb_version, model_name, generation_config],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed answer cache with TTL expiry, LRU eviction and a size cap.
+
+    Entries are tagged with the knowledge-base version they were generated from; storing an
+    answer for a new version drops every entry made from an older one.
+    """
+
+    def __init__(self, db_file=CACHE_DB_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                kb_version TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_access)')
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached answer for `key`, or None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT answer, created_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, query, answer, kb_version):
+        """Store an answer and evict stale, expired and least recently used entries."""
+        now = time.time()
+        size = len(answer.encode('utf-8')) + len(query.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, query, answer, kb_version, created_at, last_access, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, query, answer, kb_version, now, now, size),
+            )
+            # Answers built from an older knowledge base are no longer valid
+            self._conn.execute('DELETE FROM responses WHERE kb_version != ?', (kb_version,))
+            self._conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        excess_rows = max(0, count - self.max_entries)
+        excess_bytes = max(0, total - self.max_bytes)
+        evict = []
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access ASC'):
+            if excess_rows <= 0 and excess_bytes <= 0:
+                break
+            evict.append((key,))
+            excess_rows -= 1
+            excess_bytes -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evict)
+
+    def entries(self, kb_version, limit=DEFAULT_MAX_ENTRIES):
+        """Return (query, answer) pairs stored for `kb_version`, most recently used first."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT query, answer FROM responses WHERE kb_version = ? AND created_at >= ? '
+                'ORDER BY last_access DESC LIMIT ?',
+                (kb_version, time.time() - self.ttl, limit),
+            ).fetchall()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters for this process and the current cache size."""
+        with self._lock:
+            count, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': count,
+            'bytes': total,
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Return the process-wide response cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,123 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+import metrics
+from kb_cache import get_snapshot
+
+INDEX_FILE = "retrieval_index.json"
+INDEX_VERSION = 2
+
+# Common words that carry no meaning for ranking
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i in is it its me my of on or our
+so that the their them there they this to us was we what when where which who why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_lock = threading.Lock()
+_cache = {}  # kb_dir -> BM25Index
+
+def tokenize(text):
+    """Lowercase `text` and split it into searchable terms."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+class BM25Index:
+    """Okapi BM25 ranking over knowledge-base chunks."""
+
+    def __init__(self, chunks, signature=None, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.signature = signature
+        self.k1 = k1
+        self.b = b
+        self.doc_len = []
+        self.postings = {}
+        for doc_id, (source, text) in enumerate(chunks):
+            terms = Counter(tokenize(f"{source} {text}"))
+            self.doc_len.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+        self._finalize()
+
+    def _finalize(self):
+        n = len(self.doc_len)
+        self.avg_len = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query, k=6):
+        """Return up to `k` (score, source, text) tuples ranked by relevance to `query`."""
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(score, *self.chunks[doc_id]) for doc_id, score in ranked]
+
+    def to_dict(self):
+        return {
+            'version': INDEX_VERSION,
+            'signature': self.signature,
+            'chunks': self.chunks,
+            'doc_len': self.doc_len,
+            'postings': self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls.__new__(cls)
+        index.k1, index.b = 1.5, 0.75
+        index.signature = data['signature']
+        index.chunks = [tuple(chunk) for chunk in data['chunks']]
+        index.doc_len = data['doc_len']
+        index.postings = {term: [tuple(p) for p in docs] for term, docs in data['postings'].items()}
+        index._finalize()
+        return index
+
+def build_index(snapshot):
+    """Build a fresh index over the chunks of a knowledge-base snapshot."""
+    return BM25Index(snapshot.chunks, snapshot.version)
+
+@metrics.timed("retrieval_index")
+def get_index(kb_dir):
+    """Return the index for `kb_dir`, rebuilding it only when the knowledge-base content changed.
+
+    The index is kept in memory for the whole process and persisted to INDEX_FILE inside
+    `kb_dir`, so a restarted worker can load it without re-indexing the corpus.
+    """
+    kb_dir = str(kb_dir)
+    snapshot = get_snapshot(kb_dir)
+    with _lock:
+        index = _cache.get(kb_dir)
+        if index is not None and index.signature == snapshot.version:
+            return index
+
+        index_path = os.path.join(kb_dir, INDEX_FILE)
+        index = None
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('signature') == snapshot.version:
+                index = BM25Index.from_dict(data)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if index is None:
+            index = build_index(snapshot)
+            tmp_path = f"{index_path}.{os.getpid()}.tmp"  # Workers may rebuild at the same time
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(index.to_dict(), f)
+            os.replace(tmp_path, index_path)
+
+        _cache[kb_dir] = index
+        return index
@@ -1,84 +1,321 @@
 import os
+import json
+import codecs
+import shutil
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from urllib.parse import urlparse, urljoin
 import time
 
-def scrape_website(base_url, output_file="knowledge_base/scraped_content.txt", max_pages=30):
-    """Scrape content from the whole website starting from base_url, following internal links."""
+import metrics
+
+MAX_PAGE_BYTES = 5 * 1024 * 1024  # Larger responses are truncated at this size
+READ_CHUNK_BYTES = 64 * 1024
+TEXT_TAGS = frozenset(['h1', 'h2', 'h3', 'p', 'li'])
+SKIP_TAGS = frozenset(['script', 'style', 'template', 'noscript'])
+
+class HostRateLimiter:
+    """Space out requests to the same host so each host sees at most `rate` requests per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host):
+        """Block until the next request slot for `host` is available."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def _make_session(pool_size):
+    """Create a requests session whose connection pool can serve every worker."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class PageExtractor(HTMLParser):
+    """Single-pass, event-driven extraction of text and links from an HTML page.
+
+    Collects the text of every h1-h3, p and li element (in document order, like
+    find_all(...).get_text()) and every <a href> as the page streams through feed(), without
+    building a document tree.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.texts = []    # One slot per text element, filled when the element closes
+        self.hrefs = []
+        self._open = []    # Open text elements: [tag, slot, parts, list depth]
+        self._lists = 0
+        self._skip = 0
+
+    def _close_until(self, index):
+        while len(self._open) > index:
+            tag, slot, parts, _ = self._open.pop()
+            self.texts[slot] = "".join(parts).strip()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag == 'a':
+            href = dict(attrs).get('href')
+            if href is not None:
+                self.hrefs.append(href)
+        elif tag in ('ul', 'ol'):
+            self._lists += 1
+        elif tag in TEXT_TAGS:
+            # Paragraphs and list items close implicitly when a sibling of the same kind starts
+            for i in range(len(self._open) - 1, -1, -1):
+                if self._open[i][0] == tag and (tag != 'li' or self._open[i][3] == self._lists):
+                    self._close_until(i)
+                    break
+            self.texts.append(None)
+            self._open.append([tag, len(self.texts) - 1, [], self._lists])
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ('ul', 'ol'):
+            # Close list items left open inside this list
+            while self._open and self._open[-1][0] == 'li' and self._open[-1][3] == self._lists:
+                self._close_until(len(self._open) - 1)
+            self._lists = max(0, self._lists - 1)
+        elif tag in TEXT_TAGS:
+            for i in range(len(self._open) - 1, -1, -1):
+                if self._open[i][0] == tag:
+                    self._close_until(i)
+                    break
+
+    def handle_data(self, data):
+        if not self._skip:
+            for element in self._open:
+                element[2].append(data)
+
+    def close(self):
+        super().close()
+        self._close_until(0)
+
+    def text(self):
+        return "\n".join(t for t in self.texts if t)
+
+def _charset(content_type):
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            try:
+                return codecs.lookup(value.strip('"\' ')).name
+            except LookupError:
+                break
+    return 'utf-8'
+
+def _read_body(response, url):
+    """Read a streamed response body, stopping at MAX_PAGE_BYTES."""
+    body = bytearray()
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        body += chunk
+        if len(body) >= MAX_PAGE_BYTES:
+            print(f"Truncating {url}: larger than {MAX_PAGE_BYTES // (1024 * 1024)} MB")
+            del body[MAX_PAGE_BYTES:]
+            break
+    return bytes(body)
+
+def extract_page(body, url, domain, encoding='utf-8'):
+    """Return (text, internal links) for an HTML page, parsed in one streaming pass."""
+    extractor = PageExtractor()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for start in range(0, len(body), READ_CHUNK_BYTES):
+        extractor.feed(decoder.decode(body[start:start + READ_CHUNK_BYTES]))
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+
+    links = []
+    for href in extractor.hrefs:
+        full_url = urljoin(url, href)
+        if urlparse(full_url).netloc == domain:
+            links.append(full_url.split('#')[0])
+    return extractor.text(), links
+
+@metrics.timed("scrape_fetch")
+def _fetch_page(session, limiter, url, domain, cached=None):
+    """Fetch and parse one page. Returns a manifest entry for the page, or None if the page is skipped.
+
+    When `cached` holds the previous manifest entry, a conditional GET is sent and the stored
+    text and links are reused on a 304 or when the body hash is unchanged.
+    """
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    limiter.wait(urlparse(url).netloc)
+    print(f"Scraping: {url}")
+    with session.get(url, timeout=10, headers=headers, stream=True) as response:
+        if cached and response.status_code == 304:
+            print(f"Unchanged: {url}")
+            return dict(cached, changed=False)
+        if response.status_code != 200:
+            print(f"Skipping {url}: Status {response.status_code}")
+            return None
+
+        # Only scrape HTML
+        content_type = response.headers.get('Content-Type', '')
+        if 'text/html' not in content_type:
+            print(f"Skipping {url}: Not HTML ({content_type})")
+            return None
+
+        body = _read_body(response, url)
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': hashlib.sha256(body).hexdigest(),
+        }
+    if cached and cached.get('hash') == entry['hash']:
+        print(f"Unchanged: {url}")
+        return dict(cached, changed=False, **entry)
+
+    # Headers, paragraphs and list items, plus internal links, in a single pass
+    entry['text'], entry['links'] = extract_page(body, url, domain, _charset(content_type))
+    entry['changed'] = True
+
+    return entry
+
+def manifest_path(output_file):
+    """Return the path of the incremental-crawl manifest kept next to `output_file`."""
+    return os.path.splitext(output_file)[0] + ".manifest.json"
+
+def _load_manifest(path):
+    """Load a crawl manifest, returning an empty one if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get('pages'), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {'pages': {}, 'order': []}
+
+def _save_manifest(path, manifest):
+    """Write the manifest through a temporary file so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+def scrape_website(base_url, output_file="knowledge_base/scraped_content.txt", max_pages=30, workers=8, rate_limit=8.0, incremental=False):
+    """Scrape content from the whole website starting from base_url, following internal links.
+
+    Pages are fetched by `workers` threads sharing one pooled HTTP session, and each host
+    receives at most `rate_limit` requests per second. With `incremental=True` a per-URL
+    manifest is kept next to `output_file`; pages are fetched with conditional GETs, unchanged
+    pages are not reparsed, and the output file is only rewritten when a section changed.
+    Responses are capped at MAX_PAGE_BYTES and parsed without building a document tree, and
+    page sections are streamed to disk, so a full crawl's memory use does not grow with
+    `max_pages`. An incremental crawl does hold the text and links of every page, both the
+    previous manifest and the one being written, so its memory use grows with the site.
+    """
     try:
         import requests
-        from bs4 import BeautifulSoup
     except ImportError as e:
-        return False, f"Missing dependencies: {e}. Please run `pip install beautifulsoup4 requests`."
+        return False, f"Missing dependencies: {e}. Please run `pip install requests`."
 
     try:
-        print(f"Starting scrape of {base_url} (Max pages: {max_pages})...")
-        
+        print(f"Starting scrape of {base_url} (Max pages: {max_pages}, Workers: {workers})...")
+
         domain = urlparse(base_url).netloc
+        workers = max(1, int(workers))
+        limiter = HostRateLimiter(rate_limit)
+        manifest_file = manifest_path(output_file)
+        previous = _load_manifest(manifest_file) if incremental else {'pages': {}, 'order': []}
         visited = set()
-        queue = [base_url]
-        all_content = []
-        
+        # Frontier of URLs to fetch plus every URL ever queued (fragments removed for deduplication)
+        frontier = deque([base_url])
+        seen = {base_url.split('#')[0]}
+        order = []
+        pages = {}
+        changed = 0
+        sections = 0
+
         # Create output directory if it doesn't exist
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-        while queue and len(visited) < max_pages:
-            current_url = queue.pop(0)
-            
-            # Clean URL (remove fragments and query params for deduplication)
-            clean_url = current_url.split('#')[0]
-            if clean_url in visited:
-                continue
-                
-            try:
-                print(f"Scraping: {current_url}")
-                response = requests.get(current_url, timeout=10)
-                if response.status_code != 200:
-                    print(f"Skipping {current_url}: Status {response.status_code}")
-                    continue
-                
-                # Only scrape HTML
-                content_type = response.headers.get('Content-Type', '')
-                if 'text/html' not in content_type:
-                    print(f"Skipping {current_url}: Not HTML ({content_type})")
-                    continue
-
-                visited.add(clean_url)
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Extract content (headers, paragraphs, list items)
-                text_elements = soup.find_all(['h1', 'h2', 'h3', 'p', 'li'])
-                page_text = "\n".join([elem.get_text().strip() for elem in text_elements if elem.get_text().strip()])
-                
-                if page_text:
-                    all_content.append(f"\n\n{'='*50}\nURL: {current_url}\n{'='*50}\n{page_text}")
-                
-                # Find internal links
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    full_url = urljoin(current_url, href)
-                    parsed_link = urlparse(full_url)
-                    
-                    # Only follow internal links
-                    if parsed_link.netloc == domain:
-                        clean_link = full_url.split('#')[0]
-                        if clean_link not in visited and clean_link not in queue:
-                            queue.append(clean_link)
-                            
-                # Be polite
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"Error scraping {current_url}: {e}")
-                continue
-
-        if not all_content:
-            return False, "No content found or scraping failed."
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(f"Scrape Base URL: {base_url}\n")
-            f.write(f"Total Pages Scraped: {len(visited)}\n")
-            f.write("\n".join(all_content))
-            
+        # Sections are streamed to a temporary file as pages arrive instead of being held in
+        # memory, then copied behind the header once the page count is known
+        sections_path = output_file + ".sections.tmp"
+        with _make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool, \
+                open(sections_path, "w", encoding="utf-8") as sections_file:
+            while frontier and len(visited) < max_pages:
+                # Fetch the head of the frontier as one concurrent wave; results are handled in
+                # queue order so the crawl visits the same pages a sequential breadth-first crawl would
+                wave = [frontier.popleft() for _ in range(min(len(frontier), max_pages - len(visited)))]
+                futures = [
+                    pool.submit(_fetch_page, session, limiter, url, domain, previous['pages'].get(url))
+                    for url in wave
+                ]
+                for current_url, future in zip(wave, futures):
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        print(f"Error scraping {current_url}: {e}")
+                        continue
+                    if page is None:
+                        continue
+
+                    visited.add(current_url.split('#')[0])
+                    if page.pop('changed'):
+                        changed += 1
+                    order.append(current_url)
+
+                    if page['text']:
+                        if sections:
+                            sections_file.write("\n")
+                        sections_file.write(f"\n\n{'='*50}\nURL: {current_url}\n{'='*50}\n{page['text']}")
+                        sections += 1
+
+                    for clean_link in page['links']:
+                        if clean_link not in seen:
+                            seen.add(clean_link)
+                            frontier.append(clean_link)
+
+                    # Only an incremental crawl needs the page afterwards (for its manifest)
+                    if incremental:
+                        pages[current_url] = page
+
+        try:
+            if not sections:
+                return False, "No content found or scraping failed."
+
+            if incremental:
+                _save_manifest(manifest_file, {'pages': pages, 'order': order})
+                if not changed and order == previous.get('order') and os.path.exists(output_file):
+                    return True, f"Knowledge base is up to date ({len(visited)} pages checked, 0 changed)"
+
+            tmp_path = output_file + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f, open(sections_path, "r", encoding="utf-8") as sections_file:
+                f.write(f"Scrape Base URL: {base_url}\n")
+                f.write(f"Total Pages Scraped: {len(visited)}\n")
+                shutil.copyfileobj(sections_file, f)
+            os.replace(tmp_path, output_file)
+        finally:
+            os.remove(sections_path)
+
+        if incremental:
+            return True, f"Successfully scraped {len(visited)} pages to {output_file} ({changed} changed)"
         return True, f"Successfully scraped {len(visited)} pages to {output_file}"
 
     except Exception as e:
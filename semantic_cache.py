@@ -0,0 +1,195 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from response_cache import normalize_query
+from retrieval import tokenize
+
+DEFAULT_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.8"))  # Minimum Jaccard similarity for reusing an answer
+DEFAULT_MAX_ENTRIES = 2000
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_APOSTROPHE_RE = re.compile(r"'\w*")
+_KEY_TERM_RE = re.compile(r"\d+(?:[.,]\d+)*\w*|[a-z]+n['’]t\b|[a-z]+")
+
+# Words that change the answer without changing the rest of the question ("first" vs "third"
+# law, "free" vs "not free", "who" vs "where"); two questions only match if they use the same ones.
+# Retrieval drops the question words as stopwords, so the fingerprint alone cannot tell them apart
+QUESTION_WORDS = frozenset("who whom whose what when where which why how".split())
+NEGATIONS = frozenset("not no never none nor without cannot".split())
+NUMBER_WORDS = frozenset("""
+zero one two three four five six seven eight nine ten eleven twelve hundred thousand million billion
+first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth last
+""".split())
+
+def _permutations(count):
+    """Deterministic (a, b) pairs for the MinHash hash family."""
+    perms = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"perm-{i}".encode('utf-8'), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little') % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], 'little') % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+_PERMS = _permutations(NUM_PERM)
+
+def query_features(query):
+    """Fingerprint a query as its content words plus their character trigrams."""
+    text = _APOSTROPHE_RE.sub("", normalize_query(query))
+    features = set()
+    for word in tokenize(text):
+        if len(word) > 3 and word.endswith('s'):
+            word = word[:-1]
+        features.add(word)
+        padded = f" {word} "
+        features.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+def key_terms(query):
+    """Numbers, negations, ordinals and question words in a query, which must match exactly before an answer is reused."""
+    terms = set()
+    for term in _KEY_TERM_RE.findall(normalize_query(query)):
+        if term[0].isdigit():
+            terms.add(term)
+        elif term in NEGATIONS or term.endswith(("n't", "n’t")):
+            terms.add("not")
+        elif term in NUMBER_WORDS or term in QUESTION_WORDS:
+            terms.add(term)
+    return frozenset(terms)
+
+def minhash(features):
+    """Return the MinHash signature of a feature set."""
+    hashed = [int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'little') for f in features]
+    if not hashed:
+        return (0,) * NUM_PERM
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _PERMS)
+
+def similarity(a, b):
+    """Jaccard similarity between the fingerprints of two queries; 0 when their key terms differ."""
+    if key_terms(a) != key_terms(b):
+        return 0.0
+    fa, fb = query_features(a), query_features(b)
+    return len(fa & fb) / len(fa | fb) if fa and fb else 0.0
+
+class SemanticCache:
+    """Near-duplicate answer lookup using MinHash signatures and an LSH bucket index.
+
+    LSH buckets narrow the search to a few candidates; a candidate is reused only if it has the
+    same key terms (numbers, negations, ordinals) and the exact Jaccard similarity of the
+    fingerprints reaches the threshold. All entries belong to one knowledge-base version and
+    are dropped when the version changes.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_entries=DEFAULT_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.kb_version = None
+        self.hits = 0
+        self.misses = 0
+        self.hit_scores = []
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # query -> (features, signature, key terms, answer)
+        self._buckets = {}
+
+    def _bands(self, signature):
+        rows = NUM_PERM // BANDS
+        return [(i, signature[i * rows:(i + 1) * rows]) for i in range(BANDS)]
+
+    def _reset(self, kb_version):
+        self._entries.clear()
+        self._buckets.clear()
+        self.kb_version = kb_version
+
+    def _remove(self, query):
+        features, signature, _, _ = self._entries.pop(query)
+        for band in self._bands(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(query)
+                if not bucket:
+                    del self._buckets[band]
+
+    def add(self, query, answer, kb_version):
+        """Remember an answer for later near-duplicate lookups."""
+        key = normalize_query(query)
+        features = query_features(query)
+        if not features:
+            return
+        signature = minhash(features)
+        with self._lock:
+            if kb_version != self.kb_version:
+                self._reset(kb_version)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (features, signature, key_terms(query), answer)
+            for band in self._bands(signature):
+                self._buckets.setdefault(band, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def lookup(self, query, kb_version):
+        """Return (answer, matched_query, score) for the closest prior question, or None."""
+        features = query_features(query)
+        terms = key_terms(query)
+        with self._lock:
+            if kb_version != self.kb_version:
+                self._reset(kb_version)
+            best = None
+            if features:
+                candidates = set()
+                for band in self._bands(minhash(features)):
+                    candidates.update(self._buckets.get(band, ()))
+                for candidate in candidates:
+                    other, _, other_terms, answer = self._entries[candidate]
+                    if other_terms != terms:
+                        continue
+                    score = len(features & other) / len(features | other)
+                    if score >= self.threshold and (best is None or score > best[2]):
+                        best = (answer, candidate, score)
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best[1])
+            self.hits += 1
+            self.hit_scores.append(best[2])
+            del self.hit_scores[:-1000]
+            return best
+
+    def warm(self, rows, kb_version):
+        """Load (query, answer) pairs, most recently used first, e.g. from the persistent response cache."""
+        with self._lock:
+            self._reset(kb_version)
+        for query, answer in reversed(rows):
+            self.add(query, answer, kb_version)
+
+    def stats(self):
+        """Return counters and the similarity of recent hits, for tuning the threshold."""
+        with self._lock:
+            scores = list(self.hit_scores)
+            lookups = self.hits + self.misses
+            return {
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'mean_hit_score': sum(scores) / len(scores) if scores else None,
+                'min_hit_score': min(scores) if scores else None,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache(threshold=DEFAULT_THRESHOLD):
+    """Return the process-wide semantic cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache(threshold)
+        _cache.threshold = threshold
+        return _cache
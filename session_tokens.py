@@ -0,0 +1,162 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import auth_db
+
+SESSION_TTL = 7 * 24 * 60 * 60  # Tokens expire after a week
+LRU_SIZE = 10000
+REVALIDATE_SECONDS = 60         # How long a cached session is trusted before re-checking the database
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode('ascii')
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+class SessionStore:
+    """Signed, expiring session tokens for users who already passed a full credential check.
+
+    A token is `payload.signature` with an HMAC-SHA256 signature, so forged or altered tokens
+    are rejected without any lookup. Valid sessions live in an in-memory LRU; with `persist`
+    they are also stored in the users database so they survive restarts, work across worker
+    processes and can be revoked everywhere.
+    """
+
+    def __init__(self, secret=None, ttl=SESSION_TTL, persist=True, lru_size=LRU_SIZE):
+        self.ttl = ttl
+        self.persist = persist
+        self.lru_size = lru_size
+        self._lru = OrderedDict()  # session id -> (user_info, expires_at, checked_at)
+        self._lock = threading.Lock()
+        if persist:
+            self._init_table()
+        if secret is None:
+            secret = os.getenv("SESSION_SECRET") or (self._load_secret() if persist else secrets.token_hex(32))
+        self._key = secret.encode('utf-8') if isinstance(secret, str) else secret
+
+    def _init_table(self):
+        with auth_db.get_pool().connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    user_info TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    revoked INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            conn.execute('CREATE TABLE IF NOT EXISTS app_secrets (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            conn.commit()
+
+    def _load_secret(self):
+        """Load the signing key shared by every worker, creating it on first use."""
+        with auth_db.get_pool().connection() as conn:
+            conn.execute(
+                "INSERT INTO app_secrets (name, value) VALUES ('session_key', ?) ON CONFLICT(name) DO NOTHING",
+                (secrets.token_hex(32),),
+            )
+            conn.commit()
+            return conn.execute("SELECT value FROM app_secrets WHERE name = 'session_key'").fetchone()[0]
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._key, payload.encode('ascii'), hashlib.sha256).digest())
+
+    def _remember(self, session_id, user_info, expires_at, now):
+        self._lru[session_id] = (user_info, expires_at, now)
+        self._lru.move_to_end(session_id)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def issue(self, user_info):
+        """Create a token for a verified user."""
+        now = time.time()
+        session_id = secrets.token_urlsafe(16)
+        expires_at = now + self.ttl
+        payload = _b64encode(json.dumps({'sid': session_id, 'exp': int(expires_at)}).encode('utf-8'))
+        if self.persist:
+            with auth_db.get_pool().connection() as conn:
+                conn.execute(
+                    'INSERT INTO sessions (session_id, username, user_info, expires_at) VALUES (?, ?, ?, ?)',
+                    (session_id, user_info.get('username') or user_info.get('email') or '', json.dumps(user_info), expires_at),
+                )
+                conn.execute('DELETE FROM sessions WHERE expires_at < ?', (now,))
+                conn.commit()
+        with self._lock:
+            self._remember(session_id, user_info, expires_at, now)
+        return f"{payload}.{self._sign(payload)}"
+
+    def _session_id(self, token):
+        """Return (session id, expiry) for a well-formed, correctly signed token, else None."""
+        try:
+            payload, signature = token.split(".", 1)
+            if not hmac.compare_digest(signature, self._sign(payload)):
+                return None
+            data = json.loads(_b64decode(payload))
+            return data['sid'], data['exp']
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def validate(self, token):
+        """Return the user info for a valid, unexpired and unrevoked token, or None."""
+        parsed = self._session_id(token) if token else None
+        if parsed is None:
+            return None
+        session_id, expires_at = parsed
+        now = time.time()
+        if now >= expires_at:
+            self._forget(session_id)
+            return None
+
+        with self._lock:
+            cached = self._lru.get(session_id)
+            if cached is not None and (not self.persist or now - cached[2] < REVALIDATE_SECONDS):
+                self._lru.move_to_end(session_id)
+                return cached[0]
+
+        if not self.persist:
+            return None
+        with auth_db.get_pool().connection() as conn:
+            row = conn.execute(
+                'SELECT user_info, expires_at FROM sessions WHERE session_id = ? AND revoked = 0', (session_id,)
+            ).fetchone()
+        if row is None or now >= row[1]:
+            self._forget(session_id)
+            return None
+        user_info = json.loads(row[0])
+        with self._lock:
+            self._remember(session_id, user_info, row[1], now)
+        return user_info
+
+    def _forget(self, session_id):
+        with self._lock:
+            self._lru.pop(session_id, None)
+
+    def revoke(self, token):
+        """Invalidate a token (on logout)."""
+        parsed = self._session_id(token) if token else None
+        if parsed is None:
+            return
+        session_id = parsed[0]
+        self._forget(session_id)
+        if self.persist:
+            with auth_db.get_pool().connection() as conn:
+                conn.execute('UPDATE sessions SET revoked = 1 WHERE session_id = ?', (session_id,))
+                conn.commit()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Return the process-wide session store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
@@ -0,0 +1,149 @@
+import math
+import re
+import threading
+
+from kb_cache import get_snapshot
+from retrieval import STOPWORDS, tokenize
+
+TEAM_FILE = "team_info.txt"
+MIN_COVERAGE = 0.75     # IDF-weighted share of the query's terms a line must contain to count as an answer
+MAX_SNIPPETS = 5
+SNIPPET_CHARS = 300
+CURATED_BOOST = 1.5     # team_info.txt is hand-written, so its lines outrank scraped ones
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_FIELD_RE = re.compile(r"^([A-Za-z][A-Za-z ]{0,40}):\s*(.+)$")
+_MEMBER_RE = re.compile(r"^[-*•]\s*(.+?):\s*(.+)$")
+
+# A query made only of these words (plus stopwords) is answered from team_info.txt directly
+GREETING_WORDS = frozenset("hi hello hey hiya salam salaam assalam assalamualaikum greetings morning evening good".split())
+TEAM_WORDS = frozenset("team members member staff people executive executives founders".split())
+CONTACT_WORDS = frozenset("contact contacts email mail reach website site url address".split())
+SITE_WORDS = frozenset("bubloo scientist list show tell about".split())
+# Request phrasing that says nothing about what is being looked for
+FILLER_WORDS = frozenset("tell about show list know please give find info information details".split())
+
+_lock = threading.Lock()
+_cache = {}  # kb_dir -> SiteIndex
+
+def _intent(query):
+    words = set(_WORD_RE.findall(query.lower()))
+    content = words - STOPWORDS - SITE_WORDS
+    # "hello bubloo" is a greeting, "about bubloo scientist" is a question about the organization
+    if words & GREETING_WORDS and words <= GREETING_WORDS | SITE_WORDS | {"there"}:
+        return 'greeting'
+    if content and content <= TEAM_WORDS:
+        return 'team'
+    if content and content <= CONTACT_WORDS:
+        return 'contact'
+    return None
+
+class SiteIndex:
+    """Line-level inverted index over the knowledge base, plus the facts parsed from team_info.txt.
+
+    Lines repeated across scraped pages (navigation, footers) are indexed once. Terms match on
+    token boundaries, so "this" never matches "hi".
+    """
+
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.fields = {}   # e.g. 'Contact Email' -> address
+        self.team = []     # (name, role)
+        self.lines = []    # (source, text, curated)
+        self.postings = {}
+        seen = set()
+        for kb_file in snapshot.files:
+            curated = kb_file.name == TEAM_FILE
+            if curated:
+                self._parse_team_info(kb_file.text)
+            for source, text in kb_file.chunks:
+                for line in text.splitlines():
+                    key = " ".join(line.lower().split())
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    terms = set(tokenize(line))
+                    if not terms:
+                        continue
+                    line_id = len(self.lines)
+                    self.lines.append((source, line, curated))
+                    for term in terms:
+                        self.postings.setdefault(term, []).append(line_id)
+        n = len(self.lines)
+        self.idf = {term: math.log(1 + n / len(ids)) for term, ids in self.postings.items()}
+        self.unseen_idf = math.log(1 + max(n, 1))  # Terms missing from the site weigh like the rarest ones
+
+    def _parse_team_info(self, text):
+        for line in text.splitlines():
+            line = line.strip()
+            member = _MEMBER_RE.match(line)
+            if member:
+                self.team.append((member.group(1).strip(), member.group(2).strip()))
+                continue
+            field = _FIELD_RE.match(line)
+            if field:
+                self.fields[field.group(1).strip()] = field.group(2).strip()
+
+    def contact_details(self):
+        """(label, value) pairs from team_info.txt that describe how to reach the team."""
+        return [(k, v) for k, v in self.fields.items() if any(w in k.lower() for w in ("email", "website", "phone", "address", "contact"))]
+
+    def search(self, query, k=MAX_SNIPPETS):
+        """Rank lines by the weight of the query terms they contain.
+
+        Returns up to `k` (score, source, snippet, coverage) tuples, where coverage is the
+        IDF-weighted share of the query's distinct terms found in that line.
+        """
+        terms = set(tokenize(query)) - FILLER_WORDS
+        if not terms:
+            return []
+        weights = {}
+        for term in terms:
+            for line_id in self.postings.get(term, ()):
+                weights.setdefault(line_id, []).append(term)
+        total = sum(self.idf.get(t, self.unseen_idf) for t in terms)
+        ranked = []
+        for line_id, matched in weights.items():
+            source, line, curated = self.lines[line_id]
+            coverage = sum(self.idf[t] for t in matched) / total
+            ranked.append((coverage * (CURATED_BOOST if curated else 1.0), source, line, coverage))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [(score, source, _snippet(line), coverage) for score, source, line, coverage in ranked[:k]]
+
+    def answer(self, query):
+        """Resolve a query locally.
+
+        Returns a dict with 'intent' ('greeting', 'team', 'contact' or None), 'snippets' (from
+        search()) and 'answered' (False when the query should go to the language model).
+        """
+        intent = _intent(query)
+        if intent == 'team' and not self.team:
+            intent = None
+        if intent == 'contact' and not self.contact_details():
+            intent = None
+        snippets = [] if intent else self.search(query)
+        answered = intent is not None or any(s[3] >= MIN_COVERAGE for s in snippets)
+        return {'intent': intent, 'snippets': snippets if answered else [], 'answered': answered}
+
+def _snippet(line):
+    line = " ".join(line.split())
+    return line if len(line) <= SNIPPET_CHARS else line[:SNIPPET_CHARS].rsplit(" ", 1)[0] + " …"
+
+def highlight(text, query):
+    """Wrap the query's terms in `text` in Markdown bold, matching whole words only."""
+    terms = sorted(set(tokenize(query)), key=len, reverse=True)
+    if not terms:
+        return text
+    pattern = re.compile(r"\b(" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE)
+    return pattern.sub(r"**\1**", text)
+
+def get_index(kb_dir):
+    """Return the site index for `kb_dir`, rebuilt only when the knowledge-base content changes."""
+    kb_dir = str(kb_dir)
+    snapshot = get_snapshot(kb_dir)
+    with _lock:
+        index = _cache.get(kb_dir)
+        if index is None or index.version != snapshot.version:
+            index = SiteIndex(snapshot)
+            _cache[kb_dir] = index
+        return index
@@ -0,0 +1,66 @@
+"""Hammer auth_db.register_user and verify_user from many threads against a scratch database.
+
+Every user is registered by several threads at once, so exactly one registration per name
+must succeed; every later verification must succeed with the right password.
+
+Usage: python stress_auth.py [threads]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import auth_db
+
+DB_FILE = "stress_users.db"
+USERS = 24
+ROUNDS = 3
+REGISTRATIONS_PER_USER = 4
+
+def _remove_db(db_file):
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_file + suffix):
+            os.remove(db_file + suffix)
+
+def main(threads=32, db_file=DB_FILE):
+    _remove_db(db_file)
+    pool = auth_db.ConnectionPool(db_file)  # Its own pool, so the app's DB_FILE is never touched
+    try:
+        auth_db.init_db(pool)
+        names = [f"user{i}" for i in range(USERS)]
+        errors = []
+
+        def register(name):
+            ok, msg = auth_db.register_user(name, f"pw-{name}", name.title(), pool=pool)
+            if not ok and msg != "Username already exists.":
+                errors.append(msg)
+            return ok
+
+        def verify(job):
+            name, password = job
+            try:
+                if (auth_db.verify_user(name, password, pool=pool) is not None) != (password == f"pw-{name}"):
+                    errors.append(f"verification mismatch for {name}")
+            except Exception as e:
+                errors.append(str(e))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            created = sum(executor.map(register, [n for n in names for _ in range(REGISTRATIONS_PER_USER)]))
+            # One wrong password per user, well below the lockout threshold
+            jobs = [(n, f"pw-{n}") for n in names] * ROUNDS + [(n, "wrong") for n in names]
+            list(executor.map(verify, jobs))
+        elapsed = time.perf_counter() - start
+
+        operations = USERS * REGISTRATIONS_PER_USER + len(jobs)
+        print(f"{operations} operations on {threads} threads in {elapsed:.2f}s "
+              f"({operations / elapsed:.0f} ops/s)")
+        print(f"Registrations succeeded: {created}/{USERS} (expected {USERS})")
+        print(f"Errors: {len(errors)}" + (f" (first: {errors[0]})" if errors else ""))
+        return created == USERS and not errors
+    finally:
+        pool.close()
+        _remove_db(db_file)
+
+if __name__ == "__main__":
+    raise SystemExit(0 if main(int(sys.argv[1]) if len(sys.argv) > 1 else 32) else 1)
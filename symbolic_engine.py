@@ -0,0 +1,293 @@
+import multiprocessing
+import queue
+import threading
+from collections import OrderedDict
+
+import metrics
+
+POOL_SIZE = 2
+MEMORY_LIMIT = 512 * 1024 * 1024  # Address-space cap per worker process (POSIX only)
+FACTOR_TIMEOUT = 5.0
+SOLVE_TIMEOUT = 5.0
+NUMERIC_TIMEOUT = 3.0
+EXACT_MAX_DEGREE = 4              # Above this, polynomial roots are numeric unless exact ones are requested
+MAX_NUMERIC_DEGREE = 1000
+QUEUE_TIMEOUT = 10.0              # Seconds to wait for a free worker
+CACHE_SIZE = 1024
+
+class SymbolicError(Exception):
+    """Raised when an expression cannot be parsed or analysed."""
+
+class EngineBusy(SymbolicError):
+    """Raised when every worker stays busy for QUEUE_TIMEOUT seconds."""
+
+class JobTimeout(SymbolicError):
+    """Raised when a job exceeds its time limit; the worker running it is killed."""
+
+# --- Jobs (run inside the worker processes) ---
+
+def _job_factor(canonical):
+    import sympy as sp
+    return sp.latex(sp.factor(sp.sympify(canonical)))
+
+def _job_solve(canonical):
+    import sympy as sp
+    x = sp.symbols('x')
+    return [sp.latex(root) for root in sp.solve(sp.sympify(canonical), x)]
+
+def _job_coefficients(canonical):
+    """Coefficients (highest degree first, as complex numbers) of a pure polynomial in x, else None."""
+    import sympy as sp
+    x = sp.symbols('x')
+    expr = sp.sympify(canonical)
+    if expr.free_symbols != {x} or not expr.is_polynomial(x):
+        return None
+    poly = sp.Poly(expr, x)
+    if poly.degree() > MAX_NUMERIC_DEGREE:
+        return None
+    coeffs = []
+    for c in poly.all_coeffs():
+        if not c.is_number:
+            return None
+        value = complex(c.evalf())
+        if abs(value) > 1e300:
+            return None
+        coeffs.append(value)
+    return coeffs
+
+_JOBS = {
+    'factor': _job_factor,
+    'solve': _job_solve,
+    'coefficients': _job_coefficients,
+}
+
+def _limit_memory(limit):
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass  # Not supported on this platform
+
+def _worker_main(conn, memory_limit):
+    _limit_memory(memory_limit)
+    while True:
+        try:
+            name, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = ('ok', _JOBS[name](*args))
+        except MemoryError:
+            result = ('error', "Expression needs too much memory to analyse.")
+        except Exception as e:
+            result = ('error', f"{type(e).__name__}: {e}")
+        conn.send(result)
+
+# --- Worker pool (runs in the app process) ---
+
+def _context():
+    # forkserver keeps the workers independent of the app's threads and preloads SymPy once
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(['sympy'])
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, MEMORY_LIMIT), daemon=True)
+        self.process.start()
+        child.close()
+
+    def run(self, name, args, timeout):
+        self.conn.send((name, args))
+        if not self.conn.poll(timeout):
+            raise JobTimeout(f"{name} timed out after {timeout:g}s")
+        return self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+class SymbolicPool:
+    """Fixed set of worker processes; a job that overruns its timeout gets its worker killed."""
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._ctx = _context()
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle.empty() and self._started < self.size:
+                self._started += 1
+                return _Worker(self._ctx)
+        try:
+            return self._idle.get(timeout=QUEUE_TIMEOUT)
+        except queue.Empty:
+            raise EngineBusy("The algebra engine is busy, please try again in a moment.")
+
+    def run(self, name, args, timeout):
+        """Run job `name` in a worker and return its result; raises SymbolicError or JobTimeout."""
+        worker = self._acquire()
+        try:
+            status, value = worker.run(name, args, timeout)
+        except (JobTimeout, EOFError, OSError) as e:
+            # The worker is stuck or died (e.g. hit its memory limit): replace it
+            worker.kill()
+            worker = _Worker(self._ctx)
+            if isinstance(e, JobTimeout):
+                raise
+            raise SymbolicError("The algebra worker stopped unexpectedly.")
+        finally:
+            self._idle.put(worker)
+        if status == 'error':
+            raise SymbolicError(value)
+        return value
+
+class _LRU:
+    def __init__(self, size):
+        self.size = size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+_pool = None
+_pool_lock = threading.Lock()
+_parsed = _LRU(CACHE_SIZE)    # input text -> (canonical form, latex)
+_results = _LRU(CACHE_SIZE)   # (job, canonical form) -> result
+
+def get_pool():
+    """Return the process-wide worker pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SymbolicPool()
+        return _pool
+
+_MISSING = object()
+
+def _cached_job(name, canonical, timeout):
+    key = (name, canonical)
+    result = _results.get(key, _MISSING)
+    if result is _MISSING:
+        # Measured from the caller's side: queueing for a worker plus the job itself (e.g. sp.solve)
+        with metrics.timed("symbolic_job", job=name):
+            result = get_pool().run(name, (canonical,), timeout)
+        _results.put(key, result)
+    else:
+        metrics.inc("symbolic_cache_hits_total", job=name)
+    return result
+
+def parse(text):
+    """Parse user input with the restricted expression parser and return (canonical form, latex).
+
+    The parser never evaluates arbitrary code and rejects oversized input up front, so this
+    runs in the app process; only the canonical srepr form is sent to the workers.
+    """
+    import sympy as sp
+    from expr_parser import ParseError, parse_expression
+
+    key = "".join(text.split())
+    parsed = _parsed.get(key)
+    if parsed is None:
+        try:
+            expr = parse_expression(key)
+        except ParseError as e:
+            raise SymbolicError(str(e))
+        parsed = (sp.srepr(expr), sp.latex(expr))
+        _parsed.put(key, parsed)
+    return parsed
+
+def _numeric_roots(canonical):
+    """Roots via the NumPy companion-matrix solver, or None if the input is not a numeric polynomial in x."""
+    import numeric_roots
+
+    try:
+        coeffs = _cached_job('coefficients', canonical, NUMERIC_TIMEOUT)
+    except SymbolicError:
+        return None
+    if not coeffs or len(coeffs) < 2:
+        return None
+    found = numeric_roots.roots(coeffs)
+    return [numeric_roots.format_root(r) for r in numeric_roots.sort_roots(found)], len(coeffs) - 1
+
+def analyze_polynomial(text, exact=False):
+    """Factor an expression and find its roots in x, within fixed time limits.
+
+    Pure polynomials in x above EXACT_MAX_DEGREE get numeric roots from the companion-matrix
+    solver unless `exact` is set; everything else goes through sp.solve, falling back to the
+    numeric solver when that times out. Results are memoized on the canonical (srepr) form, so
+    equivalent inputs share them.
+    Returns a dict with 'latex', 'factored' and 'roots' (LaTeX strings, None when unavailable),
+    'numeric' (roots are numeric approximations) and 'notes' (what was skipped and why).
+    Raises SymbolicError when the input cannot be parsed.
+    """
+    canonical, latex = parse(text)
+    result = {'latex': latex, 'factored': None, 'roots': None, 'numeric': False, 'notes': []}
+
+    try:
+        result['factored'] = _cached_job('factor', canonical, FACTOR_TIMEOUT)
+    except JobTimeout:
+        result['notes'].append(f"Factoring stopped after {FACTOR_TIMEOUT:g}s.")
+    except SymbolicError as e:
+        result['notes'].append(f"Factoring failed: {e}")
+
+    numeric = None if exact else _numeric_roots(canonical)
+    if numeric is not None and numeric[1] > EXACT_MAX_DEGREE:
+        result['roots'], result['numeric'] = numeric[0], True
+        return result
+
+    try:
+        result['roots'] = _cached_job('solve', canonical, SOLVE_TIMEOUT)
+    except SymbolicError as e:
+        reason = f"Exact solving stopped after {SOLVE_TIMEOUT:g}s" if isinstance(e, JobTimeout) else f"Exact solving failed ({e})"
+        if numeric is None:
+            numeric = _numeric_roots(canonical)
+        if numeric is not None:
+            result['roots'], result['numeric'] = numeric[0], True
+            result['notes'].append(f"{reason}; showing numeric roots.")
+        else:
+            result['notes'].append(f"{reason}.")
+
+    return result
+
+def batch_polynomial_roots(texts):
+    """Numeric roots for many polynomial inputs, solved together by numeric_roots.batch_roots.
+
+    Returns one entry per input: a list of LaTeX roots, or None when the input is not a
+    numeric polynomial in x or cannot be parsed.
+    """
+    import numeric_roots
+
+    positions, polynomials = [], []
+    for i, text in enumerate(texts):
+        try:
+            coeffs = _cached_job('coefficients', parse(text)[0], NUMERIC_TIMEOUT)
+        except SymbolicError:
+            continue
+        if coeffs and len(coeffs) >= 2:
+            positions.append(i)
+            polynomials.append(coeffs)
+
+    results = [None] * len(texts)
+    for i, found in zip(positions, numeric_roots.batch_roots(polynomials)):
+        results[i] = [numeric_roots.format_root(r) for r in numeric_roots.sort_roots(found)]
+    return results